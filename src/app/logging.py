@@ -7,8 +7,9 @@ tipos de operação, parâmetros, resultados, timestamps e notas.
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Union, Tuple
 from datetime import datetime
+import atexit
 import json
 import uuid
 
@@ -21,17 +22,40 @@ class OperationLogger:
     incluindo IDs únicos, timestamps, parâmetros e resultados.
     """
 
-    def __init__(self, log_dir: Optional[str] = None):
+    def __init__(self, log_dir: Optional[str] = None, enabled: bool = True, buffer_size: int = 0):
         """
         Inicializa o logger.
 
         Args:
             log_dir: Diretório para salvar logs. Se None, usa ./logs.
+            enabled: Se False, log_operation não monta nem grava logs.
+            buffer_size: Se maior que zero, log_operation acumula os logs em
+                memória e os grava em lote ao atingir esse número (ou em
+                flush(), chamado também ao encerrar o processo). Útil em
+                processamento em lote; 0 grava cada log imediatamente.
         """
         if log_dir is None:
             log_dir = "./logs"
         self.log_dir = Path(log_dir)
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.enabled = enabled
+        self.buffer_size = buffer_size
+        self._pending: List[Tuple[Dict[str, Any], str]] = []
+        if enabled:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+        if enabled and buffer_size > 0:
+            atexit.register(self.flush)
+
+    def is_enabled(self) -> bool:
+        """
+        Indica se o logger está gravando logs.
+
+        Permite que chamadores evitem montar parâmetros/resultados custosos
+        quando o log está desabilitado.
+
+        Returns:
+            bool: True se os logs estão habilitados.
+        """
+        return self.enabled
 
     def create_operation_log(
         self,
@@ -96,9 +120,7 @@ class OperationLogger:
             str: Caminho do arquivo de log criado.
         """
         if filename is None:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            operation_type = log.get("operation_type", "unknown")
-            filename = f"{timestamp}_{operation_type}_{log.get('operation_id', '')[:8]}.json"
+            filename = self._log_filename(log)
 
         log_path = self.log_dir / filename
 
@@ -107,14 +129,48 @@ class OperationLogger:
 
         return str(log_path)
 
+    @staticmethod
+    def _log_filename(log: Dict[str, Any]) -> str:
+        """
+        Monta o nome do arquivo individual de um log (timestamp + tipo + ID).
+
+        Args:
+            log: Dicionário do log.
+
+        Returns:
+            str: Nome do arquivo JSON.
+        """
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        operation_type = log.get("operation_type", "unknown")
+        return f"{timestamp}_{operation_type}_{log.get('operation_id', '')[:8]}.json"
+
+    def flush(self) -> None:
+        """
+        Grava os logs acumulados (modo buffer_size > 0) de uma só vez.
+
+        Todas as linhas de operations.jsonl são escritas numa única chamada
+        de escrita; os arquivos individuais são gravados em seguida.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+
+        log_file = self.log_dir / "operations.jsonl"
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(log, ensure_ascii=False) + "\n" for log, _ in pending))
+
+        for log, filename in pending:
+            self.save_log(log, filename)
+
     def log_operation(
         self,
         operation_type: str,
         input_file: Optional[str] = None,
         output_file: Optional[str] = None,
         parameters: Optional[Dict[str, Any]] = None,
-        result: Optional[Dict[str, Any]] = None,
-        notes: Optional[str] = None,
+        result: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        notes: Union[str, Callable[[], str], None] = None,
         status: str = "success",
         error: Optional[str] = None,
         save: bool = True,
@@ -132,8 +188,10 @@ class OperationLogger:
             input_file: Arquivo de entrada.
             output_file: Arquivo de saída.
             parameters: Parâmetros utilizados.
-            result: Resultado da operação.
-            notes: Notas adicionais.
+            result: Resultado da operação, ou função que o constrói (avaliada
+                apenas se o logger estiver habilitado).
+            notes: Notas adicionais, ou função que as constrói (avaliada
+                apenas se o logger estiver habilitado).
             status: Status ("success", "error", "warning").
             error: Mensagem de erro.
             save: Se True, salva o log em arquivo.
@@ -141,8 +199,17 @@ class OperationLogger:
             suggestions: Lista de sugestões automáticas para o usuário.
 
         Returns:
-            dict: Log criado.
+            dict: Log criado (vazio se o logger estiver desabilitado).
         """
+        if not self.enabled:
+            return {}
+
+        # Resultado/notas custosos podem ser passados de forma preguiçosa
+        if callable(result):
+            result = result()
+        if callable(notes):
+            notes = notes()
+
         log = self.create_operation_log(
             operation_type=operation_type,
             input_file=input_file,
@@ -160,7 +227,14 @@ class OperationLogger:
         if suggestions:
             log["suggestions"] = suggestions
 
-        if save:
+        if save and self.buffer_size > 0:
+            # Modo em lote: o arquivo individual é gravado no próximo flush()
+            filename = self._log_filename(log)
+            self._pending.append((dict(log), filename))
+            log["log_file"] = str(self.log_dir / filename)
+            if len(self._pending) >= self.buffer_size:
+                self.flush()
+        elif save:
             # Salva em formato JSONL para fácil processamento e auditoria
             log_file = self.log_dir / "operations.jsonl"
             with open(log_file, "a", encoding="utf-8") as f:
@@ -177,17 +251,24 @@ class OperationLogger:
 _default_logger: Optional[OperationLogger] = None
 
 
-def get_logger(log_dir: Optional[str] = None) -> OperationLogger:
+def get_logger(
+    log_dir: Optional[str] = None,
+    enabled: bool = True,
+    buffer_size: int = 0
+) -> OperationLogger:
     """
     Retorna instância do logger (singleton).
 
     Args:
         log_dir: Diretório de logs (usado apenas na primeira chamada).
+        enabled: Se os logs são gravados (usado apenas na primeira chamada).
+        buffer_size: Logs acumulados antes de gravar em lote (usado apenas
+            na primeira chamada; 0 grava cada log imediatamente).
 
     Returns:
         OperationLogger: Instância do logger.
     """
     global _default_logger
     if _default_logger is None:
-        _default_logger = OperationLogger(log_dir)
+        _default_logger = OperationLogger(log_dir, enabled=enabled, buffer_size=buffer_size)
     return _default_logger
@@ -8,14 +8,16 @@ e as bibliotecas específicas de PDF.
 """
 
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator
 import fitz  # PyMuPDF
 import base64
+import copy
 import shutil
 import hashlib
 import os
 import platform
 from dataclasses import dataclass
+from functools import lru_cache
 from core.exceptions import PDFFileNotFoundError, PDFMalformedError, InvalidPageError
 from core.models import (
     TextObject, ImageObject, TableObject, LinkObject,
@@ -39,6 +41,181 @@ class ExtractedFont:
     encoding: Optional[str] = None  # Encoding da fonte (ex: "WinAnsiEncoding")
 
 
+_FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.woff', '.woff2')
+
+
+def _system_font_dirs() -> List[str]:
+    """
+    Retorna os diretórios comuns de fontes do sistema operacional atual.
+
+    Returns:
+        List[str]: Diretórios de fontes (podem não existir).
+    """
+    # Detectar sistema operacional
+    system = platform.system()
+
+    # Diretórios comuns de fontes
+    font_dirs = []
+
+    if system == "Windows":
+        # Windows: %WINDIR%\Fonts
+        windir = os.environ.get('WINDIR', 'C:\\Windows')
+        font_dirs.append(os.path.join(windir, 'Fonts'))
+        # Também verificar %LOCALAPPDATA%\Microsoft\Windows\Fonts
+        localappdata = os.environ.get('LOCALAPPDATA', '')
+        if localappdata:
+            font_dirs.append(os.path.join(localappdata, 'Microsoft', 'Windows', 'Fonts'))
+    elif system == "Darwin":  # macOS
+        font_dirs.extend([
+            '/Library/Fonts',
+            '/System/Library/Fonts',
+            os.path.expanduser('~/Library/Fonts')
+        ])
+    elif system == "Linux":
+        font_dirs.extend([
+            '/usr/share/fonts',
+            '/usr/local/share/fonts',
+            os.path.expanduser('~/.fonts'),
+            os.path.expanduser('~/.local/share/fonts')
+        ])
+
+    return font_dirs
+
+
+@lru_cache(maxsize=1)
+def _list_system_font_files() -> Tuple[Tuple[str, str], ...]:
+    """
+    Lista os arquivos de fonte dos diretórios do sistema.
+
+    A listagem é feita uma vez por processo e reutilizada em todas as
+    buscas de fonte.
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: Pares (diretório, nome do arquivo).
+    """
+    files = []
+    for font_dir in _system_font_dirs():
+        if not os.path.isdir(font_dir):
+            continue
+        try:
+            for file in os.listdir(font_dir):
+                if file.lower().endswith(_FONT_EXTENSIONS):
+                    files.append((font_dir, file))
+        except (PermissionError, OSError):
+            # Ignorar erros de permissão ou acesso
+            continue
+    return tuple(files)
+
+
+@lru_cache(maxsize=256)
+def _find_system_font_paths(font_name: str) -> Tuple[str, ...]:
+    """
+    Busca arquivo de fonte no sistema operacional.
+
+    Resultado cacheado por nome de fonte: a busca roda uma vez por processo.
+
+    Args:
+        font_name: Nome da fonte (ex: "ArialMT", "ArialNarrow-Bold")
+
+    Returns:
+        Tuple[str, ...]: Caminhos de arquivos de fonte encontrados
+    """
+    font_paths = []
+
+    # Normalizar nome da fonte para busca
+    font_base = font_name.split('-')[0].split()[0]  # "ArialNarrow-Bold" -> "ArialNarrow"
+    font_base_simple = font_base.replace('MT', '').replace('Narrow', '').strip()  # "ArialMT" -> "Arial"
+
+    # Normalizar nomes para comparação (remover espaços, hífens, underscores)
+    font_name_normalized = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
+    font_base_normalized = font_base.lower().replace(' ', '').replace('-', '').replace('_', '')
+    font_base_simple_normalized = font_base_simple.lower().replace(' ', '').replace('-', '').replace('_', '')
+
+    # Buscar arquivos de fonte (listagem dos diretórios feita uma única vez)
+    for font_dir, file in _list_system_font_files():
+        # Verificar se nome corresponde (case-insensitive)
+        file_base = Path(file).stem
+        file_base_lower = file_base.lower()
+
+        # Normalizar nome do arquivo para comparação (remover espaços, hífens, underscores)
+        file_base_normalized = file_base_lower.replace(' ', '').replace('-', '').replace('_', '')
+
+        # Prioridade 1: Correspondência exata (mais específica)
+        if font_name_normalized == file_base_normalized:
+            font_path = os.path.join(font_dir, file)
+            if os.path.isfile(font_path):
+                font_paths.insert(0, font_path)  # Inserir no início (prioridade)
+                continue
+
+        # Prioridade 2: Correspondência com base nome (ex: ArialMT → arialmt)
+        if font_base_normalized == file_base_normalized:
+            font_path = os.path.join(font_dir, file)
+            if os.path.isfile(font_path):
+                if font_path not in font_paths:
+                    font_paths.append(font_path)
+                continue
+
+        # Prioridade 3: Busca específica para fontes Arial
+        if 'arial' in font_name_normalized:
+            # ArialMT deve corresponder a arquivos com "mt" mas não "narrow" ou "bold"
+            if 'mt' in font_name_normalized and 'narrow' not in font_name_normalized:
+                if 'mt' in file_base_normalized and 'narrow' not in file_base_normalized and 'bold' not in file_base_normalized:
+                    font_path = os.path.join(font_dir, file)
+                    if os.path.isfile(font_path) and font_path not in font_paths:
+                        font_paths.append(font_path)
+                        continue
+            # ArialNarrow-Bold deve corresponder a arquivos com "narrow" E "bold"
+            elif 'narrow' in font_name_normalized and 'bold' in font_name_normalized:
+                if 'narrow' in file_base_normalized and ('bold' in file_base_normalized or 'bd' in file_base_normalized or 'black' in file_base_normalized):
+                    font_path = os.path.join(font_dir, file)
+                    if os.path.isfile(font_path) and font_path not in font_paths:
+                        font_paths.insert(0, font_path)  # Prioridade alta
+                        continue
+                # Também tentar buscar arquivo específico "arial_narrow_bold" ou similar
+                if 'narrow' in file_base_normalized and 'bold' in file_base_normalized:
+                    font_path = os.path.join(font_dir, file)
+                    if os.path.isfile(font_path) and font_path not in font_paths:
+                        font_paths.insert(0, font_path)
+                        continue
+            # ArialNarrow (sem bold) deve corresponder a arquivos com "narrow" mas SEM "bold"
+            elif 'narrow' in font_name_normalized and 'bold' not in font_name_normalized:
+                if 'narrow' in file_base_normalized and 'bold' not in file_base_normalized:
+                    font_path = os.path.join(font_dir, file)
+                    if os.path.isfile(font_path) and font_path not in font_paths:
+                        font_paths.append(font_path)
+                        continue
+
+        # Prioridade 4: Correspondência parcial (menos específica)
+        for pattern in [font_name_normalized, font_base_normalized, font_base_simple_normalized]:
+            if pattern and (pattern in file_base_normalized or file_base_normalized in pattern):
+                font_path = os.path.join(font_dir, file)
+                if os.path.isfile(font_path) and font_path not in font_paths:
+                    font_paths.append(font_path)
+                    break
+
+    return tuple(font_paths)
+
+
+@lru_cache(maxsize=32)
+def _load_builtin_font(font_name: str) -> Optional[fitz.Font]:
+    """
+    Carrega uma fonte embutida do PyMuPDF (Base-14), uma única vez por nome.
+
+    Nomes inexistentes também são memorizados, de modo que a exceção do
+    MuPDF só é levantada (e tratada) na primeira tentativa.
+
+    Args:
+        font_name: Nome curto da fonte (ex: "helv", "tiro").
+
+    Returns:
+        Optional[fitz.Font]: Fonte carregada, ou None se o nome não existir.
+    """
+    try:
+        return fitz.Font(font_name)
+    except Exception:
+        # PyMuPDF sinaliza fonte inexistente com FzErrorArgument (subclasse de Exception)
+        return None
+
 
 class PDFRepository:
     """
@@ -63,6 +240,10 @@ class PDFRepository:
         self.pdf_path = Path(pdf_path)
         self._validate_pdf_path()
         self._doc: Optional[fitz.Document] = None
+        # Cache da extração completa de texto (invalidado em mutações/salvamento)
+        self._text_objects_cache: Optional[List[TextObject]] = None
+        # Cache dos metadados (doc.metadata relê o dicionário Info a cada acesso)
+        self._metadata_cache: Optional[Dict[str, Any]] = None
 
     def _validate_pdf_path(self) -> None:
         """
@@ -105,6 +286,17 @@ class PDFRepository:
         if self._doc is not None:
             self._doc.close()
             self._doc = None
+        self._text_objects_cache = None
+        self._metadata_cache = None
+
+    def invalidate_text_cache(self) -> None:
+        """
+        Descarta o cache de extract_text_objects.
+
+        Deve ser chamado sempre que o conteúdo das páginas for alterado
+        diretamente no documento aberto (redactions, inserções, etc.).
+        """
+        self._text_objects_cache = None
 
     def get_page_count(self) -> int:
         """
@@ -120,11 +312,15 @@ class PDFRepository:
         """
         Retorna os metadados do PDF.
 
+        O dicionário é lido uma única vez e mantido em cache (atualizado por
+        set_metadata); não deve ser modificado por quem o recebe.
+
         Returns:
             dict: Dicionário com metadados do PDF.
         """
-        doc = self.open()
-        return doc.metadata
+        if self._metadata_cache is None:
+            self._metadata_cache = self.open().metadata
+        return self._metadata_cache
 
     def set_metadata(self, metadata: Dict[str, str]) -> None:
         """
@@ -135,18 +331,52 @@ class PDFRepository:
         """
         doc = self.open()
         doc.set_metadata(metadata)
+        if self._metadata_cache is not None:
+            self._metadata_cache.update(metadata)
+
+    def find_text_pages(self) -> List[int]:
+        """
+        Lista as páginas que podem conter texto, sem extraí-lo.
+
+        Faz uma varredura barata no content stream bruto de cada página em
+        busca do operador BT. Páginas sem BT e sem Form XObjects (que podem
+        conter texto próprio) têm apenas gráficos/imagens e são ignoradas.
 
-    def extract_text_objects(self) -> List[TextObject]:
+        Returns:
+            List[int]: Números das páginas candidatas (0-indexed).
+        """
+        doc = self.open()
+        pages = []
+
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            if b"BT" in page.read_contents() or page.get_xobjects():
+                pages.append(page_num)
+
+        return pages
+
+    def extract_text_objects(self, pages: Optional[Iterable[int]] = None) -> List[TextObject]:
         """
         Extrai todos os objetos de texto do PDF.
 
+        A extração do documento inteiro é memorizada até a próxima mutação
+        (veja invalidate_text_cache); chamadas repetidas retornam cópias dos
+        objetos em cache, que o chamador pode alterar livremente.
+
+        Args:
+            pages: Páginas a processar (0-indexed). Se None, processa todas.
+
         Returns:
             List[TextObject]: Lista de objetos de texto extraídos.
         """
+        if pages is None and self._text_objects_cache is not None:
+            return [copy.copy(obj) for obj in self._text_objects_cache]
+
         doc = self.open()
         text_objects = []
 
-        for page_num in range(len(doc)):
+        page_numbers = range(len(doc)) if pages is None else sorted(pages)
+        for page_num in page_numbers:
             page = doc[page_num]
             blocks = page.get_text("dict")
 
@@ -201,8 +431,38 @@ class PDFRepository:
                             if text_obj.content:
                                 text_objects.append(text_obj)
 
+        if pages is None:
+            # O cache guarda instâncias próprias: alterações do chamador não o afetam
+            self._text_objects_cache = [copy.copy(obj) for obj in text_objects]
+
         return text_objects
 
+    def extract_text_objects_indexed(
+        self,
+        pages: Optional[Iterable[int]] = None
+    ) -> Tuple[List[TextObject], Dict[str, TextObject], Dict[int, List[TextObject]]]:
+        """
+        Extrai os objetos de texto junto com índices por ID e por página.
+
+        Evita varreduras lineares da lista a cada busca por ID.
+
+        Args:
+            pages: Páginas a processar (0-indexed). Se None, processa todas.
+
+        Returns:
+            Tuple: (lista de objetos, {id: objeto}, {página: [objetos]}).
+        """
+        text_objects = self.extract_text_objects(pages=pages)
+        by_id: Dict[str, TextObject] = {}
+        by_page: Dict[int, List[TextObject]] = {}
+
+        for text_obj in text_objects:
+            # Mantém a primeira ocorrência, como a busca linear fazia
+            by_id.setdefault(text_obj.id, text_obj)
+            by_page.setdefault(text_obj.page, []).append(text_obj)
+
+        return text_objects, by_id, by_page
+
     def extract_fonts(self) -> Dict[str, ExtractedFont]:
         """
         Extrai todas as fontes usadas no PDF com suas propriedades.
@@ -307,130 +567,16 @@ class PDFRepository:
         """
         Busca arquivo de fonte no sistema operacional.
 
+        O resultado é cacheado por nome de fonte para todo o processo
+        (ver _find_system_font_paths).
+
         Args:
             font_name: Nome da fonte (ex: "ArialMT", "ArialNarrow-Bold")
 
         Returns:
             List[str]: Lista de caminhos de arquivos de fonte encontrados
         """
-        font_paths = []
-
-        # Normalizar nome da fonte para busca
-        font_base = font_name.split('-')[0].split()[0]  # "ArialNarrow-Bold" -> "ArialNarrow"
-        font_base_simple = font_base.replace('MT', '').replace('Narrow', '').strip()  # "ArialMT" -> "Arial"
-
-        # Detectar sistema operacional
-        system = platform.system()
-
-        # Diretórios comuns de fontes
-        font_dirs = []
-
-        if system == "Windows":
-            # Windows: %WINDIR%\Fonts
-            windir = os.environ.get('WINDIR', 'C:\\Windows')
-            font_dirs.append(os.path.join(windir, 'Fonts'))
-            # Também verificar %LOCALAPPDATA%\Microsoft\Windows\Fonts
-            localappdata = os.environ.get('LOCALAPPDATA', '')
-            if localappdata:
-                font_dirs.append(os.path.join(localappdata, 'Microsoft', 'Windows', 'Fonts'))
-        elif system == "Darwin":  # macOS
-            font_dirs.extend([
-                '/Library/Fonts',
-                '/System/Library/Fonts',
-                os.path.expanduser('~/Library/Fonts')
-            ])
-        elif system == "Linux":
-            font_dirs.extend([
-                '/usr/share/fonts',
-                '/usr/local/share/fonts',
-                os.path.expanduser('~/.fonts'),
-                os.path.expanduser('~/.local/share/fonts')
-            ])
-
-        # Extensões de arquivo de fonte
-        font_extensions = ['.ttf', '.otf', '.ttc', '.woff', '.woff2']
-
-        # Buscar arquivos de fonte
-        for font_dir in font_dirs:
-            if not os.path.isdir(font_dir):
-                continue
-
-            try:
-                for file in os.listdir(font_dir):
-                    file_lower = file.lower()
-
-                    # Verificar se é arquivo de fonte
-                    if not any(file_lower.endswith(ext) for ext in font_extensions):
-                        continue
-
-                    # Verificar se nome corresponde (case-insensitive)
-                    file_base = Path(file).stem
-                    file_base_lower = file_base.lower()
-                    file_full_lower = file_lower
-
-                    # Normalizar nomes para comparação (remover espaços, hífens, underscores)
-                    font_name_normalized = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
-                    font_base_normalized = font_base.lower().replace(' ', '').replace('-', '').replace('_', '')
-                    font_base_simple_normalized = font_base_simple.lower().replace(' ', '').replace('-', '').replace('_', '')
-                    file_base_normalized = file_base_lower.replace(' ', '').replace('-', '').replace('_', '')
-
-                    # Prioridade 1: Correspondência exata (mais específica)
-                    if font_name_normalized == file_base_normalized:
-                        font_path = os.path.join(font_dir, file)
-                        if os.path.isfile(font_path):
-                            font_paths.insert(0, font_path)  # Inserir no início (prioridade)
-                            continue
-
-                    # Prioridade 2: Correspondência com base nome (ex: ArialMT → arialmt)
-                    if font_base_normalized == file_base_normalized:
-                        font_path = os.path.join(font_dir, file)
-                        if os.path.isfile(font_path):
-                            if font_path not in font_paths:
-                                font_paths.append(font_path)
-                            continue
-
-                    # Prioridade 3: Busca específica para fontes Arial
-                    if 'arial' in font_name_normalized:
-                        # ArialMT deve corresponder a arquivos com "mt" mas não "narrow" ou "bold"
-                        if 'mt' in font_name_normalized and 'narrow' not in font_name_normalized:
-                            if 'mt' in file_base_normalized and 'narrow' not in file_base_normalized and 'bold' not in file_base_normalized:
-                                font_path = os.path.join(font_dir, file)
-                                if os.path.isfile(font_path) and font_path not in font_paths:
-                                    font_paths.append(font_path)
-                                    continue
-                        # ArialNarrow-Bold deve corresponder a arquivos com "narrow" E "bold"
-                        elif 'narrow' in font_name_normalized and 'bold' in font_name_normalized:
-                            if 'narrow' in file_base_normalized and ('bold' in file_base_normalized or 'bd' in file_base_normalized or 'black' in file_base_normalized):
-                                font_path = os.path.join(font_dir, file)
-                                if os.path.isfile(font_path) and font_path not in font_paths:
-                                    font_paths.insert(0, font_path)  # Prioridade alta
-                                    continue
-                            # Também tentar buscar arquivo específico "arial_narrow_bold" ou similar
-                            if 'narrow' in file_base_normalized and 'bold' in file_base_normalized:
-                                font_path = os.path.join(font_dir, file)
-                                if os.path.isfile(font_path) and font_path not in font_paths:
-                                    font_paths.insert(0, font_path)
-                                    continue
-                        # ArialNarrow (sem bold) deve corresponder a arquivos com "narrow" mas SEM "bold"
-                        elif 'narrow' in font_name_normalized and 'bold' not in font_name_normalized:
-                            if 'narrow' in file_base_normalized and 'bold' not in file_base_normalized:
-                                font_path = os.path.join(font_dir, file)
-                                if os.path.isfile(font_path) and font_path not in font_paths:
-                                    font_paths.append(font_path)
-                                    continue
-
-                    # Prioridade 4: Correspondência parcial (menos específica)
-                    for pattern in [font_name_normalized, font_base_normalized, font_base_simple_normalized]:
-                        if pattern and (pattern in file_base_normalized or file_base_normalized in pattern):
-                            font_path = os.path.join(font_dir, file)
-                            if os.path.isfile(font_path) and font_path not in font_paths:
-                                font_paths.append(font_path)
-                                break
-            except (PermissionError, OSError):
-                # Ignorar erros de permissão ou acesso
-                continue
-
-        return font_paths
+        return list(_find_system_font_paths(font_name))
 
     def get_font_for_text_object(self, font_name: str, fonts_dict: Dict[str, ExtractedFont]) -> Tuple[Optional[fitz.Font], str]:
         """
@@ -513,21 +659,15 @@ class PDFRepository:
         # Tentar mapeamento direto
         if font_name in font_mapping:
             mapped_name, needs_bold = font_mapping[font_name]
-            try:
-                font = fitz.Font(mapped_name)
+            font = _load_builtin_font(mapped_name)
+            if font is not None:
                 # Se precisa bold, aplicar (nota: PyMuPDF não permite modificar is_bold diretamente)
                 # O mapeamento já escolhe a fonte correta (ex: hebo para bold)
-                if needs_bold and hasattr(font, 'is_bold'):
+                if needs_bold and hasattr(font, 'is_bold') and mapped_name == "helv":
                     # PyMuPDF pode não suportar aplicar bold diretamente
                     # Tentar versão bold se disponível
-                    try:
-                        if mapped_name == "helv":
-                            font = fitz.Font("hebo")  # Helvetica Bold
-                    except:
-                        pass
+                    font = _load_builtin_font("hebo") or font  # Helvetica Bold
                 return font, "fallback"
-            except Exception:
-                pass
 
         # Estratégia 4: Mapeamento baseado em padrões no nome
         name_upper = font_name.upper()
@@ -535,64 +675,54 @@ class PDFRepository:
         # Detectar família Arial
         if "ARIAL" in name_upper:
             if "BOLD" in name_upper or "BLACK" in name_upper:
-                try:
-                    return fitz.Font("hebo"), "fallback"  # Helvetica Bold
-                except:
-                    pass
-            try:
-                return fitz.Font("helv"), "fallback"  # Helvetica
-            except:
-                pass
+                font = _load_builtin_font("hebo")  # Helvetica Bold
+                if font is not None:
+                    return font, "fallback"
+            font = _load_builtin_font("helv")  # Helvetica
+            if font is not None:
+                return font, "fallback"
 
         # Detectar família Times
         if "TIMES" in name_upper:
             if "BOLD" in name_upper and "ITALIC" in name_upper:
-                try:
-                    return fitz.Font("tibii"), "fallback"  # Times Bold Italic
-                except:
-                    pass
+                font = _load_builtin_font("tibii")  # Times Bold Italic
+                if font is not None:
+                    return font, "fallback"
             if "BOLD" in name_upper:
-                try:
-                    return fitz.Font("tibd"), "fallback"  # Times Bold
-                except:
-                    pass
+                font = _load_builtin_font("tibd")  # Times Bold
+                if font is not None:
+                    return font, "fallback"
             if "ITALIC" in name_upper:
-                try:
-                    return fitz.Font("tiit"), "fallback"  # Times Italic
-                except:
-                    pass
-            try:
-                return fitz.Font("tiro"), "fallback"  # Times Roman
-            except:
-                pass
+                font = _load_builtin_font("tiit")  # Times Italic
+                if font is not None:
+                    return font, "fallback"
+            font = _load_builtin_font("tiro")  # Times Roman
+            if font is not None:
+                return font, "fallback"
 
         # Detectar família Courier
         if "COURIER" in name_upper:
             if "BOLD" in name_upper and "OBLIQUE" in name_upper or "ITALIC" in name_upper:
-                try:
-                    return fitz.Font("cobit"), "fallback"  # Courier Bold Oblique
-                except:
-                    pass
+                font = _load_builtin_font("cobit")  # Courier Bold Oblique
+                if font is not None:
+                    return font, "fallback"
             if "BOLD" in name_upper:
-                try:
-                    return fitz.Font("cobo"), "fallback"  # Courier Bold
-                except:
-                    pass
+                font = _load_builtin_font("cobo")  # Courier Bold
+                if font is not None:
+                    return font, "fallback"
             if "OBLIQUE" in name_upper or "ITALIC" in name_upper:
-                try:
-                    return fitz.Font("coit"), "fallback"  # Courier Oblique
-                except:
-                    pass
-            try:
-                return fitz.Font("cour"), "fallback"  # Courier
-            except:
-                pass
+                font = _load_builtin_font("coit")  # Courier Oblique
+                if font is not None:
+                    return font, "fallback"
+            font = _load_builtin_font("cour")  # Courier
+            if font is not None:
+                return font, "fallback"
 
         # Último recurso: Helvetica (fallback mínimo)
-        try:
-            return fitz.Font("helv"), "fallback"
-        except:
-            return None, "none"
+        font = _load_builtin_font("helv")
+        if font is not None:
+            return font, "fallback"
+        return None, "none"
 
     def embed_font(self, page: fitz.Page, font: fitz.Font, font_name: str) -> Optional[str]:
         """
@@ -768,6 +898,7 @@ class PDFRepository:
             output_path = str(Path(output_path))
 
         doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
+        self._text_objects_cache = None
         return output_path
 
     def merge_pdfs(self, pdf_paths: List[str]) -> fitz.Document:
@@ -791,12 +922,16 @@ class PDFRepository:
         # Abrir PDF de base (este)
         merged_doc = fitz.open(str(self.pdf_path))
 
-        # Inserir páginas dos outros PDFs
+        # Inserir páginas dos outros PDFs, um arquivo aberto por vez
+        # (sequencial: o PyMuPDF não suporta uso concorrente, nem mesmo com
+        # documentos distintos em threads diferentes)
         for pdf_path in pdf_paths:
             if str(pdf_path) != str(self.pdf_path):
-                other_doc = fitz.open(str(pdf_path))
-                merged_doc.insert_pdf(other_doc)
-                other_doc.close()
+                with fitz.open(str(pdf_path)) as other_doc:
+                    merged_doc.insert_pdf(other_doc)
+                # Esvaziar o cache (store) do MuPDF com objetos do arquivo já
+                # fechado: o pico de memória fica limitado ao arquivo atual
+                fitz.TOOLS.store_shrink(100)
 
         return merged_doc
 
@@ -804,6 +939,8 @@ class PDFRepository:
         """
         Exclui páginas específicas do PDF.
 
+        O documento aberto é alterado no próprio lugar.
+
         Args:
             page_numbers: Lista de números de páginas a serem excluídas (0-indexed).
 
@@ -821,19 +958,13 @@ class PDFRepository:
             if page_num < 0 or page_num >= max_pages:
                 raise InvalidPageError(page_num, max_pages)
 
-        # Ordenar páginas em ordem decrescente para deletar corretamente
-        sorted_pages = sorted(set(page_numbers), reverse=True)
-
-        # Criar novo documento com páginas mantidas
-        new_doc = fitz.open()
-        pages_to_keep = [i for i in range(max_pages) if i not in set(page_numbers)]
+        # Manter o complemento com um único select(): o MuPDF reconstrói a
+        # árvore de páginas uma vez (e preserva metadados, outlines, etc.)
+        pages_to_delete = set(page_numbers)
+        doc.select([i for i in range(max_pages) if i not in pages_to_delete])
 
-        for page_num in pages_to_keep:
-            new_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
-
-        doc.close()
-        self._doc = new_doc
-        return new_doc
+        self._text_objects_cache = None
+        return doc
 
     def split_pages(self, ranges: List[tuple]) -> List[fitz.Document]:
         """
@@ -845,18 +976,35 @@ class PDFRepository:
         Returns:
             List[fitz.Document]: Lista de documentos PDF resultantes.
         """
+        return list(self.iter_split_pages(ranges))
+
+    def iter_split_pages(self, ranges: List[tuple]) -> Iterator[fitz.Document]:
+        """
+        Gera os documentos de split_pages um de cada vez.
+
+        Todas as faixas são validadas antes do primeiro documento ser criado;
+        quem consome deve salvar e fechar cada documento antes do próximo,
+        de modo que apenas um subdocumento fique em memória.
+
+        Args:
+            ranges: Lista de tuplas (start, end) indicando faixas de páginas (0-indexed).
+
+        Yields:
+            fitz.Document: Documento PDF de cada faixa, na ordem recebida.
+
+        Raises:
+            InvalidPageError: Se alguma faixa for inválida.
+        """
         doc = self.open()
-        result_docs = []
 
         for start, end in ranges:
             if start < 0 or end >= len(doc) or start > end:
                 raise InvalidPageError(start, len(doc))
 
+        for start, end in ranges:
             new_doc = fitz.open()
             new_doc.insert_pdf(doc, from_page=start, to_page=end)
-            result_docs.append(new_doc)
-
-        return result_docs
+            yield new_doc
 
     def create_backup(self, backup_path: Optional[str] = None) -> str:
         """
@@ -6,11 +6,16 @@ operações principais do PDF-cli conforme especificações da Fase 3.
 """
 
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Union, Tuple, Callable
+from typing import List, Dict, Optional, Any, Union, Tuple, Callable, Iterator
+import io
 import json
+import os
+import re
 import shutil
 import time
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
 from core.models import (
     TextObject, ImageObject, TableObject, LinkObject,
@@ -23,13 +28,79 @@ from core.exceptions import (
     PDFFileNotFoundError, PDFMalformedError, TextNotFoundError,
     InvalidPageError, PaddingError, PDFCliException
 )
-from core.font_manager import FontManager, FontMatchQuality
+from core.font_manager import FontManager, FontMatchQuality, detect_name_variants
 from core.engine_manager import EngineManager
-from core.engine_manager import EngineManager, EngineResult, EngineType, create_audit_log
+from core.engine_manager import EngineManager, EngineResult, EngineType, write_audit_log
 import fitz  # PyMuPDF
 from app.pdf_repo import PDFRepository
 from app.logging import get_logger
 
+# Opções de salvamento completo (não incremental): remove objetos não
+# referenciados/duplicados, comprime streams e limpa content streams
+_SAVE_OPTS = {
+    "garbage": 3,
+    "deflate": True,
+    "clean": True,
+    "encryption": fitz.PDF_ENCRYPT_KEEP,
+}
+
+# orjson (opcional): serialização JSON em C, bem mais rápida que o json padrão
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+# ijson (opcional): leitura em streaming de JSONs grandes em restore-from-json
+IJSON_AVAILABLE = False
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+# Pillow (opcional): filtros de imagem em replace-image
+PIL_AVAILABLE = False
+try:
+    from PIL import Image as PILImage, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    pass
+
+
+# Nomes curtos das 14 fontes padrão do PDF (Base-14), aceitos diretamente
+# por page.insert_text(fontname=...) sem carregar um fitz.Font
+_BASE14_FONTS = frozenset({
+    "helv", "heit", "hebo", "hebi",
+    "tiro", "tiit", "tibo", "tibi",
+    "cour", "coit", "cobo", "cobi",
+    "symb", "zadb",
+})
+
+# Número de página ou faixa "início-fim" (um trecho de parse_page_numbers/ranges)
+_PAGE_PART_RE = re.compile(r"\s*(\d+)(?:\s*-\s*(\d+))?\s*")
+
+# Cor hexadecimal RRGGBB (sem "#"), validada antes da conversão em _hex_to_rgb
+_HEX_COLOR_RE = re.compile(r"[0-9a-fA-F]{6}")
+
+# Campos de metadados alteráveis por edit-metadata
+_EDITABLE_METADATA_KEYS = ("title", "author", "subject", "keywords", "creator", "producer")
+
+# Fontes comuns mapeadas para fontes padrão do PyMuPDF
+# (chaves em minúsculas: a busca normaliza o nome com .lower())
+_FONT_MAPPING = {
+    name.lower(): base14 for name, base14 in {
+        "ArialMT": "helv",
+        "Arial": "helv",
+        "ArialNarrow": "helv",
+        "ArialNarrow-Bold": "hebo",  # Helvetica-Bold
+        "Times": "tiro",
+        "Times-Roman": "tiro",
+        "Courier": "cour",
+    }.items()
+}
+
 
 # ============================================================================
 # EXTRAÇÃO DE OBJETOS
@@ -161,20 +232,12 @@ def export_objects(
                 # Normalizar nome da fonte extraída para corresponder às estatísticas
                 normalized_font_name = _normalize_font_name(font_data.name)
                 usage = font_stats.get(normalized_font_name, {})
-                name_upper = font_data.name.upper() if font_data.name else ""
                 variants = []
                 if font_data.is_bold:
                     variants.append("Bold")
                 if font_data.is_italic:
                     variants.append("Italic")
-                if "NARROW" in name_upper:
-                    variants.append("Narrow")
-                if "CONDENSED" in name_upper:
-                    variants.append("Condensed")
-                if "LIGHT" in name_upper:
-                    variants.append("Light")
-                if "BLACK" in name_upper:
-                    variants.append("Black")
+                variants.extend(detect_name_variants(font_data.name))
 
                 fonts_list.append({
                     "name": font_data.name,  # Nome original (com prefixo se houver)
@@ -213,8 +276,7 @@ def export_objects(
             output_data["_fonts"] = fonts_info
 
         # Salvar JSON
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        write_json(output_path, output_data)
 
         # Estatísticas
         stats = {
@@ -353,6 +415,132 @@ def export_images(
 # EDIÇÃO DE OBJETOS
 # ============================================================================
 
+@dataclass
+class OccurrenceDetail:
+    """
+    Detalhes de uma ocorrência processada em _edit_text_all_occurrences.
+
+    Usa __slots__ (sem __dict__ por instância), já que documentos grandes
+    podem gerar milhares de ocorrências. Use to_dict() para o formato
+    entregue ao feedback_callback e gravado nos logs.
+    """
+    __slots__ = (
+        "id", "page", "x", "y", "width", "height",
+        "original_content", "new_content", "font_original", "font_used",
+        "font_fallback", "font_source", "font_size", "substitution_type", "changes",
+    )
+
+    id: str
+    page: int
+    x: float
+    y: float
+    width: float
+    height: float
+    original_content: str
+    new_content: str
+    font_original: Optional[str]
+    font_used: str
+    font_fallback: bool
+    font_source: str
+    font_size: float
+    substitution_type: str
+    changes: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário para serialização JSON."""
+        return {
+            "id": self.id,
+            "page": self.page,
+            "coordinates": {
+                "x": round(self.x, 2),
+                "y": round(self.y, 2),
+                "width": round(self.width, 2),
+                "height": round(self.height, 2)
+            },
+            "original_content": self.original_content,
+            "new_content": self.new_content,
+            "font_original": self.font_original,
+            "font_used": self.font_used,
+            "font_fallback": self.font_fallback,
+            "font_source": self.font_source,
+            "font_size": self.font_size,
+            "substitution_type": self.substitution_type,
+            "changes": self.changes
+        }
+
+
+def _write_page_replacements(
+    page: "fitz.Page",
+    pending_writes: List[Tuple[TextObject, str, Optional["fitz.Font"], float, float]],
+    color_rgb: Tuple[float, float, float]
+) -> None:
+    """
+    Aplica as redações pendentes de uma página e escreve os textos substitutos.
+
+    Cada página é uma unidade independente de trabalho: todas as redações
+    são aplicadas de uma vez e todos os textos vão num único TextWriter.
+    A execução é sequencial: documentos PyMuPDF não são thread-safe.
+
+    Args:
+        page: Página com as anotações de redação já adicionadas.
+        pending_writes: Tuplas (objeto original, conteúdo final, fonte
+            carregada, tamanho da fonte, rotação) a escrever na página.
+        color_rgb: Cor usada no fallback via insert_text.
+    """
+    # Remover textos antigos da página de uma só vez
+    page.apply_redactions()
+
+    # SOLUÇÃO DEFINITIVA: Usar TextWriter ao invés de insert_text
+    # TextWriter suporta fontes customizadas diretamente via objeto Font
+    # Isso preserva a fonte original sem fallback para Helvetica
+    try:
+        # Um único TextWriter acumula todos os textos da página
+        tw = fitz.TextWriter(page.rect)
+
+        for target_obj, final_content, font_loaded, final_font_size, _ in pending_writes:
+            # IMPORTANTE: Calcular posição correta
+            # TextWriter usa coordenadas (x, y) onde y é a baseline do texto
+            # target_obj.y é o topo da bounding box
+            # Baseline ≈ topo + (altura * 0.82) para fontes padrão
+            baseline_y = target_obj.y + (target_obj.height * 0.82)
+
+            # Usar objeto Font diretamente (não nome!)
+            # Isso é a chave para preservar fontes customizadas
+            if not font_loaded:
+                # Fallback: usar fonte padrão Helvetica
+                font_loaded = _get_font("helv")
+
+            # TextWriter.append() não aceita 'color' e 'rotate' diretamente
+            # Usar apenas: pos, text, font, fontsize
+            tw.append(
+                pos=(target_obj.x, baseline_y),
+                text=final_content,
+                font=font_loaded,  # Objeto Font, não string!
+                fontsize=final_font_size
+            )
+
+        tw.fill_opacity = 1.0
+
+        # Escrever textos na página
+        tw.write_text(page)
+
+    except Exception as e:
+        # Se TextWriter falhar, tentar insert_text como último recurso
+        try:
+            for target_obj, final_content, _, final_font_size, final_rotation in pending_writes:
+                baseline_y = target_obj.y + (target_obj.height * 0.82)
+                page.insert_text(
+                    point=(target_obj.x, baseline_y),
+                    text=final_content,
+                    fontsize=final_font_size,
+                    fontname="helv",  # Fallback seguro
+                    color=color_rgb,
+                    rotate=final_rotation
+                )
+        except Exception as e2:
+            raise Exception(f"Erro crítico ao inserir texto: {e2}")
+
+
 def _edit_text_all_occurrences(
     pdf_path: str,
     output_path: str,
@@ -394,48 +582,49 @@ def _edit_text_all_occurrences(
     # Inicializar font manager para rastrear fontes
     font_manager = FontManager()
 
-    # Criar backup se solicitado
+    # Criar backup (se solicitado) e extrair objetos de texto ORIGINAIS antes
+    # da edição (para comparação de fontes) abrindo o PDF uma única vez
     backup_path = None
-    if create_backup:
-        with PDFRepository(pdf_path) as repo:
-            backup_path = repo.create_backup()
-
-    # Extrair objetos de texto ORIGINAIS antes da edição (para comparação de fontes)
-    original_text_objects = []
     with PDFRepository(pdf_path) as repo:
-        original_text_objects = repo.extract_text_objects()
-
-    # Filtrar apenas objetos que contêm o search_term (serão modificados)
-    target_objects = [obj for obj in original_text_objects if search_term in obj.content]
+        if _backup_needed(create_backup, pdf_path, output_path):
+            backup_path = repo.create_backup()
+        # Páginas só com gráficos/imagens não precisam ser extraídas
+        text_pages = repo.find_text_pages()
+        original_text_objects = repo.extract_text_objects(pages=text_pages)
+
+    # Filtrar apenas objetos que contêm o search_term (serão modificados),
+    # guardando a posição da primeira ocorrência: uma única busca por objeto
+    target_objects = []
+    match_positions = {}
+    for obj in original_text_objects:
+        pos = obj.content.find(search_term)
+        if pos >= 0:
+            target_objects.append(obj)
+            match_positions[obj.id] = pos
+    search_len = len(search_term)
     target_object_ids = [obj.id for obj in target_objects]
 
-    # Sempre usar arquivo temporário para evitar problemas de lock no Windows
-    # PyMuPDF com incremental=False não pode salvar no mesmo arquivo que foi aberto
+    # Salvar sempre em arquivo temporário para evitar problemas de lock no Windows
+    # PyMuPDF com incremental=False não pode salvar no mesmo arquivo que foi aberto.
+    # O PDF de entrada é aberto diretamente (sem cópia de trabalho): as edições
+    # acontecem em memória e só o arquivo salvo é movido para o destino final.
     import tempfile
     output_path_obj = Path(output_path)
 
-    # Criar dois arquivos temporários: um para trabalhar e outro para salvar
-    working_temp = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', dir=output_path_obj.parent)
-    working_temp.close()
-    working_temp_path = working_temp.name
-
     save_temp = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', dir=output_path_obj.parent)
     save_temp.close()
     save_temp_path = save_temp.name
 
     final_output_path = str(output_path_obj)
 
-    # Copiar arquivo para arquivo temporário de trabalho
-    shutil.copy(pdf_path, working_temp_path)
-
     # Contador de ocorrências processadas
     occurrences_processed = 0
-    processed_ids = []
-    occurrences_details = []  # Lista de detalhes de cada ocorrência processada
+    # Detalhes de cada ocorrência processada (pré-alocado: o total é conhecido)
+    occurrences_details: List[Optional[OccurrenceDetail]] = [None] * len(target_objects)
 
     # Abrir documento UMA VEZ e processar todas as ocorrências
     # Isso evita problemas de lock de arquivo no Windows e é mais eficiente (DRY)
-    with PDFRepository(working_temp_path) as repo:
+    with PDFRepository(pdf_path) as repo:
         doc = repo.open()
 
         # OPÇÃO 1 + 2: Extrair fontes originais do PDF antes da edição
@@ -446,345 +635,297 @@ def _edit_text_all_occurrences(
             input_file=pdf_path,
             output_file=None,
             parameters={"fonts_found": len(fonts_dict)},
-            result={"font_names": list(fonts_dict.keys())},
+            result=lambda: {"font_names": list(fonts_dict.keys())},
             status="info",
-            notes=f"Extraídas {len(fonts_dict)} fontes do PDF original para preservação"
+            notes=lambda: f"Extraídas {len(fonts_dict)} fontes do PDF original para preservação"
         )
 
-        # Cache de fontes carregadas (para reutilização)
-        font_cache = {}
-
-        # Preparar cor (reutilizável)
-        color_rgb = (0, 0, 0)
-        if color:
-            hex_color = color.lstrip("#")
-            if len(hex_color) == 6:
-                color_rgb = tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-
-        # Processar ocorrências em loop até não encontrar mais
-        while True:
-            # Extrair textos (necessário recarregar para ver mudanças após redaction)
-            text_objects = repo.extract_text_objects()
-
-            # Encontrar próxima ocorrência
-            target_obj = None
-            for obj in text_objects:
-                # Ignorar objetos já processados (por ID)
-                if obj.id in processed_ids:
-                    continue
-                # Buscar ocorrência que contém o search_term
-                if search_term in obj.content:
-                    target_obj = obj
-                    break
+        # Estado resolvido por fonte (fonte carregada, origem, nomes, requisitos)
+        font_state: Dict[Optional[str], Dict[str, Any]] = {}
 
-            # Se não encontrou mais ocorrências, parar
-            if target_obj is None:
-                break
+        # Fontes já embeddadas: (página, fonte) -> nome do recurso na página
+        embedded_fonts: Dict[Tuple[int, Optional[str]], Optional[str]] = {}
 
-            # Marcar como processado
-            processed_ids.append(target_obj.id)
-            occurrences_processed += 1
+        # Preparar cor (reutilizável)
+        color_rgb = _hex_to_rgb(color)
 
-            # Determinar conteúdo final (substituição parcial ou completa)
-            original_content = target_obj.content
-            if search_term in original_content and search_term != original_content:
-                # Substituição parcial: preservar texto completo, substituir apenas substring
-                final_content = original_content.replace(search_term, new_content, 1)
-            else:
-                # Substituição completa
-                final_content = new_content
-
-            # Determinar propriedades finais
-            final_font = target_obj.font_name if not font_name else font_name
-            # IMPORTANTE: Preservar tamanho visual, não apenas tamanho em pontos
-            # Se font_size não foi especificado, usar o tamanho original
-            # Mas também considerar altura visual do texto original
-            original_height = target_obj.height
-            original_font_size = target_obj.font_size
-            final_font_size = target_obj.font_size if font_size is None else font_size
-            final_rotation = target_obj.rotation if rotation is None else rotation
-
-            # OPÇÃO 1 + 2: Carregar fonte usando extração e embeddagem
-            font_loaded = None
-            font_source = "unknown"
-            font_fallback_occurred = False
-
-            # Tentar obter fonte do cache primeiro
-            if final_font and final_font in font_cache:
-                font_loaded = font_cache[final_font]
-                font_source = "cache"
-            else:
-                # Usar nova função que tenta múltiplas estratégias
-                font_loaded, font_source = repo.get_font_for_text_object(final_font, fonts_dict)
-
-                if font_loaded:
-                    # Detectar se é fonte embeddada (melhor opção)
-                    if final_font in fonts_dict and fonts_dict[final_font].font_file_path:
-                        font_source = "embedded"
-
-                    # Cachear fonte para reutilização
-                    if final_font:
-                        font_cache[final_font] = font_loaded
-
-                    # Verificar se houve fallback e registrar no font_manager
-                    # Se a fonte usada não corresponde exatamente à original, houve fallback
-                    if font_source in ["system", "extracted", "fallback", "cache"] and final_font:
-                        # Verificar se nome da fonte carregada corresponde
-                        loaded_font_name = font_loaded.name if hasattr(font_loaded, 'name') else ""
-                        font_name_matches = (loaded_font_name.lower() in final_font.lower() or
-                                           final_font.lower() in loaded_font_name.lower())
-
-                        # Determinar qualidade da correspondência para font_manager
-                        if font_source == "extracted" or font_source == "embedded":
-                            match_quality = FontMatchQuality.EXACT
-                        elif font_name_matches and font_source in ["system", "cache"]:
-                            match_quality = FontMatchQuality.EXACT
-                        elif font_source in ["system", "cache"] and not font_name_matches:
-                            # Fonte do sistema mas nome não corresponde = variante
-                            match_quality = FontMatchQuality.VARIANT
-                        elif font_source == "fallback":
-                            # Fallback explícito = fonte faltante
-                            match_quality = FontMatchQuality.FALLBACK
-                        else:
-                            match_quality = FontMatchQuality.SIMILAR
-
-                        # Registrar no font_manager apenas se não for correspondência exata
-                        if match_quality != FontMatchQuality.EXACT:
-                            font_manager.add_requirement(
-                                font_name=final_font,
-                                found_font=loaded_font_name,
-                                match_quality=match_quality,
-                                system_path=getattr(font_loaded, '_fontfile', None),
-                                page=target_obj.page
-                            )
+        # Agrupar alvos por página: cada página recebe todas as redações de
+        # uma vez (um único apply_redactions) e um único TextWriter
+        targets_by_page: Dict[int, List[TextObject]] = {}
+        for target_obj in target_objects:
+            targets_by_page.setdefault(target_obj.page, []).append(target_obj)
 
-                        if not font_name_matches:
-                            # Nome não corresponde - indica fallback
-                            if font_source != "embedded":
-                                font_fallback_occurred = True
-                                if font_source not in ["fallback"]:
-                                    font_source = "fallback"  # Marcar como fallback se nome não corresponde
+        for page_idx, page_targets in targets_by_page.items():
+            # Aplicar edição no PDF
+            page = doc[page_idx]
+            pending_writes = []
+
+            for target_obj in page_targets:
+                # IDs são determinísticos e únicos: cada alvo é processado uma vez
+                occurrences_processed += 1
+
+                # Determinar conteúdo final (substituição parcial ou completa)
+                # Todos os alvos já contêm search_term (filtro da extração original)
+                original_content = target_obj.content
+                original_font_name = target_obj.font_name
+                original_font_size = target_obj.font_size
+                original_height = target_obj.height
+                is_partial = search_term != original_content
+                if is_partial:
+                    # Substituição parcial: preservar texto completo, substituir apenas a
+                    # primeira ocorrência (posição já localizada no filtro)
+                    pos = match_positions[target_obj.id]
+                    final_content = original_content[:pos] + new_content + original_content[pos + search_len:]
                 else:
-                    # Falha total
-                    font_source = "none"
-                    font_fallback_occurred = True
-                    # Registrar fonte faltante
+                    # Substituição completa
+                    final_content = new_content
+
+                # Determinar propriedades finais
+                final_font = original_font_name if not font_name else font_name
+                # IMPORTANTE: Preservar tamanho visual, não apenas tamanho em pontos
+                # Se font_size não foi especificado, usar o tamanho original
+                # Mas também considerar altura visual do texto original
+                final_font_size = original_font_size if font_size is None else font_size
+                final_rotation = target_obj.rotation if rotation is None else rotation
+
+                # OPÇÃO 1 + 2: Carregar fonte usando extração e embeddagem
+                # O estado de cada fonte distinta é resolvido uma única vez e
+                # reutilizado pelas demais ocorrências que usam a mesma fonte
+                state = font_state.get(final_font)
+                if state is None:
+                    font_fallback_occurred = False
+                    requirement = None  # (found_font, match_quality, system_path) a registrar
+
+                    # Usar nova função que tenta múltiplas estratégias
+                    font_loaded, font_source = repo.get_font_for_text_object(final_font, fonts_dict)
+                    # fitz.Font sempre expõe .name: normalizar uma vez aqui
+                    loaded_name = font_loaded.name if font_loaded is not None else None
+
+                    if font_loaded:
+                        # Detectar se é fonte embeddada (melhor opção)
+                        if final_font in fonts_dict and fonts_dict[final_font].font_file_path:
+                            font_source = "embedded"
+
+                        # Verificar se houve fallback e registrar no font_manager
+                        # Se a fonte usada não corresponde exatamente à original, houve fallback
+                        if font_source in ["system", "extracted", "fallback"] and final_font:
+                            # Verificar se nome da fonte carregada corresponde
+                            loaded_font_name = loaded_name or ""
+                            loaded_lower = loaded_font_name.lower()
+                            final_lower = final_font.lower()
+                            font_name_matches = loaded_lower in final_lower or final_lower in loaded_lower
+
+                            # Determinar qualidade da correspondência para font_manager
+                            if font_source == "extracted":
+                                match_quality = FontMatchQuality.EXACT
+                            elif font_name_matches and font_source == "system":
+                                match_quality = FontMatchQuality.EXACT
+                            elif font_source == "system" and not font_name_matches:
+                                # Fonte do sistema mas nome não corresponde = variante
+                                match_quality = FontMatchQuality.VARIANT
+                            elif font_source == "fallback":
+                                # Fallback explícito = fonte faltante
+                                match_quality = FontMatchQuality.FALLBACK
+                            else:
+                                match_quality = FontMatchQuality.SIMILAR
+
+                            # Registrar no font_manager apenas se não for correspondência exata
+                            if match_quality != FontMatchQuality.EXACT:
+                                requirement = (loaded_font_name, match_quality, getattr(font_loaded, '_fontfile', None))
+
+                            if not font_name_matches:
+                                # Nome não corresponde - indica fallback
+                                font_fallback_occurred = True
+                                font_source = "fallback"  # Marcar como fallback se nome não corresponde
+                    else:
+                        # Falha total
+                        font_source = "none"
+                        font_fallback_occurred = True
+                        # Registrar fonte faltante
+                        requirement = (None, FontMatchQuality.MISSING, None)
+
+                    # Obter nome da fonte para uso no insert_text (sem espaços, sem caracteres especiais)
+                    if loaded_name:
+                        # Remover espaços e caracteres especiais do nome para usar no insert_text
+                        # PyMuPDF não aceita espaços no fontname
+                        fontname_to_use = loaded_name.replace(' ', '').replace('-', '')
+                    else:
+                        fontname_to_use = final_font.replace(' ', '').replace('-', '') if final_font else "helv"
+
+                    # Preparar nome seguro para fonte (sem espaços) - será usado no insert_font
+                    safe_font_name = _sanitize_fontname(final_font) if final_font else fontname_to_use
+
+                    # Determinar fonte usada para log/feedback
+                    display_font_name = loaded_name or final_font or "helv"
+                    if font_source == "embedded":
+                        font_used_source = f"embeddada do PDF ({final_font})"
+                    elif font_source == "extracted":
+                        font_used_source = f"extraída ({final_font})"
+                    elif font_source == "system":
+                        font_used_source = f"sistema ({display_font_name}) - embeddada no PDF"
+                    elif font_source == "fallback":
+                        font_used_source = f"fallback padrão (Helvetica)"
+                        font_fallback_occurred = True
+                    else:
+                        font_used_source = f"original ({final_font})"
+
+                    state = {
+                        "font_loaded": font_loaded,
+                        "font_source": font_source,
+                        "font_fallback_occurred": font_fallback_occurred,
+                        "requirement": requirement,
+                        "fontname_to_use": fontname_to_use,
+                        "safe_font_name": safe_font_name,
+                        "display_font_name": display_font_name,
+                        "font_used": display_font_name if loaded_name else fontname_to_use,
+                        "font_used_source": font_used_source,
+                    }
+                    font_state[final_font] = state
+
+                font_loaded = state["font_loaded"]
+                font_source = state["font_source"]
+                font_fallback_occurred = state["font_fallback_occurred"]
+                fontname_to_use = state["fontname_to_use"]
+                safe_font_name = state["safe_font_name"]
+                display_font_name = state["display_font_name"]
+                font_used_source = state["font_used_source"]
+                embedded_font_name = None  # Será definido após embeddagem na página
+
+                # Registrar requisito (ocorrência/página) no font_manager
+                if state["requirement"] is not None:
+                    found_font, match_quality, system_path = state["requirement"]
                     font_manager.add_requirement(
                         font_name=final_font,
-                        found_font=None,
-                        match_quality=FontMatchQuality.MISSING,
+                        found_font=found_font,
+                        match_quality=match_quality,
+                        system_path=system_path,
                         page=target_obj.page
                     )
 
-            # IMPORTANTE: Ajustar tamanho da fonte para preservar altura visual
-            # Se a fonte mudou (fallback ou sistema), pode ter métricas diferentes
-            # Calcular tamanho necessário baseado na altura original real
-            # Ajuste será aplicado se:
-            # 1. Fonte mudou (system ou fallback) OU
-            # 2. Fonte foi carregada mas nome não corresponde (indica fallback)
-            font_changed = (font_source in ["system", "fallback"]) or (font_loaded and font_fallback_occurred)
-
-            if font_changed and original_font_size > 0:
-                try:
-                    # Calcular proporção real da altura original em relação ao tamanho da fonte
-                    # Isso nos diz o quão "alta" essa fonte específica é
-                    height_ratio = original_height / original_font_size if original_font_size > 0 else 1.3
-
-                    # Para preservar altura visual, calcular tamanho necessário
-                    # Estratégia: preservar altura absoluta (original_height) ao invés de tamanho em pontos
-                    # Se queremos altura H e nova fonte tem proporção padrão (1.2), tamanho = H / 1.2
-                    standard_ratio = 1.2  # Proporção padrão altura/tamanho
-
-                    # Calcular tamanho necessário para preservar altura original
-                    adjusted_size = original_height / standard_ratio
-
-                    # Se proporção original é significativamente diferente (>15%), usar proporção original
-                    # Isso é mais preciso para fontes com métricas especiais
-                    if abs(height_ratio - standard_ratio) > 0.15:
-                        adjusted_size = original_height / height_ratio
-
-                    # Limitar ajuste para não ser muito extremo (entre 0.8x e 1.3x do original)
-                    # Isso previne ajustes muito grandes que podem quebrar layout
-                    if adjusted_size < original_font_size * 0.8:
-                        adjusted_size = original_font_size * 0.9  # Redução moderada
-                    elif adjusted_size > original_font_size * 1.3:
-                        adjusted_size = original_font_size * 1.15  # Aumento moderado
-
-                    # Aplicar ajuste
-                    final_font_size = max(1.0, round(adjusted_size, 1))  # Mínimo 1pt, 1 casa decimal
-                except Exception as e:
-                    # Se falhar, usar tamanho original
-                    pass
-
-            # Obter nome da fonte para uso no insert_text (sem espaços, sem caracteres especiais)
-            if font_loaded and hasattr(font_loaded, 'name'):
-                font_loaded_name = font_loaded.name
-                # Remover espaços e caracteres especiais do nome para usar no insert_text
-                # PyMuPDF não aceita espaços no fontname
-                fontname_to_use = font_loaded_name.replace(' ', '').replace('-', '')
-            else:
-                fontname_to_use = final_font.replace(' ', '').replace('-', '') if final_font else "helv"
-
-            # Preparar nome seguro para fonte (sem espaços) - será usado no insert_font
-            safe_font_name = final_font.replace(' ', '').replace('-', '').replace('_', '') if final_font else fontname_to_use.replace(' ', '').replace('-', '')
-            embedded_font_name = None  # Será definido após embeddagem na página
-
-            # Determinar fonte usada para log/feedback
-            display_font_name = font_loaded.name if font_loaded and hasattr(font_loaded, 'name') else (final_font or "helv")
-            if font_source == "embedded":
-                font_used_source = f"embeddada do PDF ({final_font})"
-            elif font_source == "extracted":
-                font_used_source = f"extraída ({final_font})"
-            elif font_source == "system":
-                font_used_source = f"sistema ({display_font_name}) - embeddada no PDF"
-            elif font_source == "fallback":
-                font_used_source = f"fallback padrão (Helvetica)"
-                font_fallback_occurred = True
-            else:
-                font_used_source = f"original ({final_font})"
-
-            # Coletar detalhes da ocorrência
-            occurrence_details = {
-                "id": target_obj.id,
-                "page": target_obj.page,
-                "coordinates": {
-                    "x": round(target_obj.x, 2),
-                    "y": round(target_obj.y, 2),
-                    "width": round(target_obj.width, 2),
-                    "height": round(target_obj.height, 2)
-                },
-                "original_content": original_content,
-                "new_content": final_content,
-                "font_original": final_font,
-                "font_used": display_font_name if font_loaded and hasattr(font_loaded, 'name') else fontname_to_use,
-                "font_fallback": font_fallback_occurred,
-                "font_source": font_used_source,
-                "font_size": final_font_size,
-                "substitution_type": "parcial" if search_term in original_content and search_term != original_content else "completa",
-                "changes": []
-            }
-
-            # Detectar mudanças específicas
-            if original_content != final_content:
-                occurrence_details["changes"].append(f"Conteúdo: '{original_content[:50]}...' → '{final_content[:50]}...'")
-            if font_name and font_name != target_obj.font_name:
-                occurrence_details["changes"].append(f"Fonte: {target_obj.font_name} → {font_name}")
-            if font_size is not None and font_size != target_obj.font_size:
-                occurrence_details["changes"].append(f"Tamanho: {target_obj.font_size}pt → {font_size}pt")
-            if color and color != target_obj.color:
-                occurrence_details["changes"].append(f"Cor: {target_obj.color} → {color}")
-            if align and align != target_obj.align:
-                occurrence_details["changes"].append(f"Alinhamento: {target_obj.align or 'default'} → {align}")
-
-            occurrences_details.append(occurrence_details)
-
-            # Chamar callback de feedback se fornecido
-            if feedback_callback:
-                feedback_callback(occurrence_details)
+                # IMPORTANTE: Ajustar tamanho da fonte para preservar altura visual
+                # Se a fonte mudou (fallback ou sistema), pode ter métricas diferentes
+                # Calcular tamanho necessário baseado na altura original real
+                # Ajuste será aplicado se:
+                # 1. Fonte mudou (system ou fallback) OU
+                # 2. Fonte foi carregada mas nome não corresponde (indica fallback)
+                font_changed = (font_source in ["system", "fallback"]) or (font_loaded and font_fallback_occurred)
+
+                if font_changed and original_font_size > 0:
+                    try:
+                        # Calcular proporção real da altura original em relação ao tamanho da fonte
+                        # Isso nos diz o quão "alta" essa fonte específica é
+                        height_ratio = original_height / original_font_size if original_font_size > 0 else 1.3
+
+                        # Para preservar altura visual, calcular tamanho necessário
+                        # Estratégia: preservar altura absoluta (original_height) ao invés de tamanho em pontos
+                        # Se queremos altura H e nova fonte tem proporção padrão (1.2), tamanho = H / 1.2
+                        standard_ratio = 1.2  # Proporção padrão altura/tamanho
+
+                        # Calcular tamanho necessário para preservar altura original
+                        adjusted_size = original_height / standard_ratio
+
+                        # Se proporção original é significativamente diferente (>15%), usar proporção original
+                        # Isso é mais preciso para fontes com métricas especiais
+                        if abs(height_ratio - standard_ratio) > 0.15:
+                            adjusted_size = original_height / height_ratio
+
+                        # Limitar ajuste para não ser muito extremo (entre 0.8x e 1.3x do original)
+                        # Isso previne ajustes muito grandes que podem quebrar layout
+                        if adjusted_size < original_font_size * 0.8:
+                            adjusted_size = original_font_size * 0.9  # Redução moderada
+                        elif adjusted_size > original_font_size * 1.3:
+                            adjusted_size = original_font_size * 1.15  # Aumento moderado
+
+                        # Aplicar ajuste
+                        final_font_size = max(1.0, round(adjusted_size, 1))  # Mínimo 1pt, 1 casa decimal
+                    except Exception as e:
+                        # Se falhar, usar tamanho original
+                        pass
 
-            # Aplicar edição no PDF
-            page = doc[target_obj.page]
-
-            # Embeddar fonte na página ANTES de usar (se for fonte do sistema)
-            # IMPORTANTE: safe_font_name já foi definido acima usando final_font
-            # Precisamos embeddar usando esse nome e depois usar o MESMO nome no insert_text
-            if font_loaded and font_source in ["system"] and hasattr(font_loaded, '_fontfile') and font_loaded._fontfile:
-                try:
-                    # Embeddar usando o nome seguro (final_font sem espaços/hífens)
-                    # Isso garante que o nome usado no insert_font seja o mesmo do insert_text
-                    embedded_font_name = repo.embed_font(page, font_loaded, final_font)
-                    # Se embeddagem foi bem-sucedida, usar o nome retornado (que é o safe_font_name)
+                # Detectar mudanças específicas
+                changes = []
+                if original_content != final_content:
+                    changes.append(f"Conteúdo: '{original_content[:50]}...' → '{final_content[:50]}...'")
+                if font_name and font_name != original_font_name:
+                    changes.append(f"Fonte: {original_font_name} → {font_name}")
+                if font_size is not None and font_size != original_font_size:
+                    changes.append(f"Tamanho: {original_font_size}pt → {font_size}pt")
+                if color and color != target_obj.color:
+                    changes.append(f"Cor: {target_obj.color} → {color}")
+                if align and align != target_obj.align:
+                    changes.append(f"Alinhamento: {target_obj.align or 'default'} → {align}")
+
+                # Coletar detalhes da ocorrência
+                occurrence_details = OccurrenceDetail(
+                    id=target_obj.id,
+                    page=target_obj.page,
+                    x=target_obj.x,
+                    y=target_obj.y,
+                    width=target_obj.width,
+                    height=original_height,
+                    original_content=original_content,
+                    new_content=final_content,
+                    font_original=final_font,
+                    font_used=state["font_used"],
+                    font_fallback=font_fallback_occurred,
+                    font_source=font_used_source,
+                    font_size=final_font_size,
+                    substitution_type="parcial" if is_partial else "completa",
+                    changes=changes
+                )
+                occurrences_details[occurrences_processed - 1] = occurrence_details
+
+                # Chamar callback de feedback se fornecido
+                if feedback_callback:
+                    feedback_callback(occurrence_details.to_dict())
+
+                # Embeddar fonte na página ANTES de usar (se for fonte do sistema)
+                # IMPORTANTE: safe_font_name já foi definido acima usando final_font
+                # Precisamos embeddar usando esse nome e depois usar o MESMO nome no insert_text
+                # Cada fonte é embeddada uma única vez por página; as demais
+                # ocorrências reutilizam o nome de recurso já registrado
+                embed_key = (page_idx, final_font)
+                if embed_key in embedded_fonts:
+                    embedded_font_name = embedded_fonts[embed_key]
                     if embedded_font_name:
-                        safe_font_name = embedded_font_name  # Usar nome embeddado
-                    # Se não retornou nome mas embeddagem pode ter funcionado, manter safe_font_name
-                except Exception as e:
-                    # Se falhar ao embeddar, continuar com nome seguro original
-                    pass
-
-            # Remover texto antigo usando redaction
-            bbox = fitz.Rect(target_obj.x, target_obj.y, target_obj.x + target_obj.width, target_obj.y + target_obj.height)
-            page.add_redact_annot(bbox, fill=(1, 1, 1))
-            page.apply_redactions()
+                        safe_font_name = embedded_font_name
+                elif font_loaded and font_source in ["system"] and hasattr(font_loaded, '_fontfile') and font_loaded._fontfile:
+                    try:
+                        # Embeddar usando o nome seguro (final_font sem espaços/hífens)
+                        # Isso garante que o nome usado no insert_font seja o mesmo do insert_text
+                        embedded_font_name = repo.embed_font(page, font_loaded, final_font)
+                        # Se embeddagem foi bem-sucedida, usar o nome retornado (que é o safe_font_name)
+                        if embedded_font_name:
+                            safe_font_name = embedded_font_name  # Usar nome embeddado
+                        # Se não retornou nome mas embeddagem pode ter funcionado, manter safe_font_name
+                    except Exception as e:
+                        # Se falhar ao embeddar, continuar com nome seguro original
+                        pass
+                    embedded_fonts[embed_key] = embedded_font_name
 
-            # SOLUÇÃO DEFINITIVA: Usar TextWriter ao invés de insert_text
-            # TextWriter suporta fontes customizadas diretamente via objeto Font
-            # Isso preserva a fonte original sem fallback para Helvetica
-            try:
-                # Criar TextWriter para a página
-                tw = fitz.TextWriter(page.rect)
-
-                # IMPORTANTE: Calcular posição correta
-                # TextWriter usa coordenadas (x, y) onde y é a baseline do texto
-                # target_obj.y é o topo da bounding box
-                # Baseline ≈ topo + (altura * 0.82) para fontes padrão
-                baseline_y = target_obj.y + (original_height * 0.82)
-
-                # Usar objeto Font diretamente (não nome!)
-                # Isso é a chave para preservar fontes customizadas
-                if font_loaded:
-                    # Usar fonte carregada (do sistema ou extraída)
-                    # TextWriter.append() não aceita 'color' e 'rotate' diretamente
-                    # Usar apenas: pos, text, font, fontsize
-                    tw.append(
-                        pos=(target_obj.x, baseline_y),
-                        text=final_content,
-                        font=font_loaded,  # Objeto Font, não string!
-                        fontsize=final_font_size
-                    )
-                    # Aplicar cor após append se necessário
-                    # TextWriter usa fill_color separadamente
-                    tw.fill_opacity = 1.0
-                else:
-                    # Fallback: usar fonte padrão Helvetica
-                    fallback_font = fitz.Font("helv")
-                    tw.append(
-                        pos=(target_obj.x, baseline_y),
-                        text=final_content,
-                        font=fallback_font,
-                        fontsize=final_font_size
-                    )
-                    font_fallback_occurred = True
-                    font_source = "fallback"
-                    font_used_source = "fallback padrão (Helvetica)"
+                # Marcar texto antigo para remoção (redação aplicada por página)
+                page.add_redact_annot(_bbox_rect(target_obj), fill=(1, 1, 1))
+                pending_writes.append((target_obj, final_content, font_loaded, final_font_size, final_rotation))
 
-                # Escrever texto na página
-                tw.write_text(page)
+            # Remover textos antigos e escrever os novos (uma passada por página)
+            _write_page_replacements(page, pending_writes, color_rgb)
 
-            except Exception as e:
-                # Se TextWriter falhar, tentar insert_text como último recurso
-                # Logger não tem método error, usar log_operation com status error
-                try:
-                    baseline_y = target_obj.y + (original_height * 0.82)
-                    page.insert_text(
-                        point=(target_obj.x, baseline_y),
-                        text=final_content,
-                        fontsize=final_font_size,
-                        fontname="helv",  # Fallback seguro
-                        color=color_rgb,
-                        rotate=final_rotation
-                    )
-                    font_fallback_occurred = True
-                    font_source = "fallback"
-                    font_used_source = "fallback padrão (Helvetica) - TextWriter falhou"
-                except Exception as e2:
-                    raise Exception(f"Erro crítico ao inserir texto: {e2}")
+        # Extrair objetos MODIFICADOS do documento em memória (já reflete as
+        # edições) para a detecção de fallback, sem reabrir o arquivo salvo.
+        # Só as páginas editadas interessam: a comparação exige mesma página.
+        modified_text_objects = repo.extract_text_objects(pages=targets_by_page.keys()) if targets_by_page else []
 
         # Salvar PDF APENAS UMA VEZ após todas as edições (em arquivo temporário diferente do que foi aberto)
         # PyMuPDF requer salvar em arquivo diferente quando incremental=False
-        doc.save(save_temp_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
+        doc.save(save_temp_path, **_SAVE_OPTS)
         # O context manager fechará o documento automaticamente ao sair do bloco 'with'
 
-    # Limpar arquivo temporário de trabalho e mover arquivo salvo para o nome final
+    # Mover arquivo salvo para o nome final
     try:
-        # Remover arquivo temporário de trabalho
-        if Path(working_temp_path).exists():
-            Path(working_temp_path).unlink()
-
-        # Mover arquivo salvo para o nome final
         output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-        if output_path_obj.exists():
-            output_path_obj.unlink()
-        shutil.move(save_temp_path, final_output_path)
+        # os.replace é atômico (mesmo diretório): sobrescreve o destino sem
+        # janela em que o arquivo final não existe
+        os.replace(save_temp_path, final_output_path)
         output_path = final_output_path
     except Exception as e:
         # Se não conseguir mover, logar erro mas continuar com arquivo temporário
@@ -796,125 +937,118 @@ def _edit_text_all_occurrences(
             status="warning"
         )
         output_path = save_temp_path
-        # Tentar limpar arquivo temporário de trabalho
-        try:
-            if Path(working_temp_path).exists():
-                Path(working_temp_path).unlink()
-        except:
-            pass
+
+    # Serializar detalhes uma única vez (log e retorno)
+    occurrences_details_dicts = [detail.to_dict() for detail in occurrences_details]
 
     # Fase 5: Detectar fallback de fonte após edição e aplicar fallback automático
     engine_results = []
     start_time_pymupdf = time.time()
 
-    try:
-        # Extrair objetos MODIFICADOS após edição para comparação
-        modified_text_objects = []
-        with PDFRepository(output_path) as repo:
-            modified_text_objects = repo.extract_text_objects()
-
-        # Verificar preservação de fontes após edição com PyMuPDF
-        font_comparisons = engine_manager.detect_font_fallback(
-            original_objects=original_text_objects,
-            modified_objects=modified_text_objects,
-            target_object_ids=target_object_ids,
-            search_term=search_term,  # Texto buscado para melhor correspondência
-            new_content=new_content   # Novo conteúdo para validação
-        )
-
-        fallback_detected = any(comp.font_fallback_detected for comp in font_comparisons)
-        execution_time_pymupdf = (time.time() - start_time_pymupdf) * 1000
+    # Sem ocorrências editadas não há fontes a comparar
+    if target_objects:
+        try:
+            # Verificar preservação de fontes após edição com PyMuPDF
+            font_comparisons = engine_manager.detect_font_fallback(
+                original_objects=original_text_objects,
+                modified_objects=modified_text_objects,
+                target_object_ids=target_object_ids,
+                search_term=search_term,  # Texto buscado para melhor correspondência
+                new_content=new_content   # Novo conteúdo para validação
+            )
 
-        # Criar resultado do PyMuPDF
-        pymupdf_result = EngineResult(
-            engine=EngineType.PYMUPDF,
-            success=True,
-            output_path=output_path,
-            font_comparisons=font_comparisons,
-            execution_time_ms=execution_time_pymupdf
-        )
-        engine_manager.attempts.append(pymupdf_result)
-        engine_results.append(pymupdf_result)
+            fallback_detected = any(comp.font_fallback_detected for comp in font_comparisons)
+            execution_time_pymupdf = (time.time() - start_time_pymupdf) * 1000
 
-        # Se houve fallback e prefer_engine é pymupdf, tentar pypdf automaticamente
-        if fallback_detected and prefer_engine.lower() == "pymupdf":
-            logger.log_operation(
-                operation_type="edit-text-font-fallback-detected",
-                input_file=pdf_path,
-                output_file=output_path,
-                parameters={
-                    "fallback_detected": True,
-                    "occurrences_with_fallback": sum(1 for comp in font_comparisons if comp.font_fallback_detected),
-                    "attempting_fallback_to": "pypdf"
-                },
-                status="info",
-                notes=f"Fallback de fonte detectado. Tentando com pypdf automaticamente..."
+            # Criar resultado do PyMuPDF
+            pymupdf_result = EngineResult(
+                engine=EngineType.PYMUPDF,
+                success=True,
+                output_path=output_path,
+                font_comparisons=font_comparisons,
+                execution_time_ms=execution_time_pymupdf
             )
+            engine_manager.attempts.append(pymupdf_result)
+            engine_results.append(pymupdf_result)
 
-            # Tentar edição com pypdf
-            pypdf_result = engine_manager.edit_text_with_pypdf(
-                pdf_path=pdf_path,
-                output_path=f"{output_path}.pypdf",  # Arquivo temporário para pypdf
-                search_term=search_term,
-                new_content=new_content,
-                target_object_ids=target_object_ids,
-                original_objects=original_text_objects
-            )
-            engine_manager.attempts.append(pypdf_result)
-            engine_results.append(pypdf_result)
-
-            # Se pypdf teve sucesso e preservou fontes, usar esse resultado
-            if pypdf_result.success and not pypdf_result.any_font_fallback:
-                # Mover arquivo do pypdf para o destino final
-                try:
-                    if Path(output_path).exists():
-                        Path(output_path).unlink()
-                    if Path(f"{output_path}.pypdf").exists():
-                        shutil.move(f"{output_path}.pypdf", output_path)
+            # Se houve fallback e prefer_engine é pymupdf, tentar pypdf automaticamente
+            if fallback_detected and prefer_engine.lower() == "pymupdf":
+                logger.log_operation(
+                    operation_type="edit-text-font-fallback-detected",
+                    input_file=pdf_path,
+                    output_file=output_path,
+                    parameters={
+                        "fallback_detected": True,
+                        "occurrences_with_fallback": sum(1 for comp in font_comparisons if comp.font_fallback_detected),
+                        "attempting_fallback_to": "pypdf"
+                    },
+                    status="info",
+                    notes=f"Fallback de fonte detectado. Tentando com pypdf automaticamente..."
+                )
+
+                # Tentar edição com pypdf
+                pypdf_output_path = f"{output_path}.pypdf"
+                pypdf_result = engine_manager.edit_text_with_pypdf(
+                    pdf_path=pdf_path,
+                    output_path=pypdf_output_path,  # Arquivo temporário para pypdf
+                    search_term=search_term,
+                    new_content=new_content,
+                    target_object_ids=target_object_ids,
+                    original_objects=original_text_objects
+                )
+                engine_manager.attempts.append(pypdf_result)
+                engine_results.append(pypdf_result)
+
+                # Se pypdf teve sucesso e preservou fontes, usar esse resultado
+                if pypdf_result.success and not pypdf_result.any_font_fallback:
+                    # Mover arquivo do pypdf para o destino final
+                    try:
+                        if os.path.exists(pypdf_output_path):
+                            os.replace(pypdf_output_path, output_path)
+                            logger.log_operation(
+                                operation_type="edit-text-engine-fallback-success",
+                                input_file=pdf_path,
+                                output_file=output_path,
+                                parameters={"engine_used": "pypdf", "font_preserved": True},
+                                status="success",
+                                notes="Fallback para pypdf preservou fontes com sucesso"
+                            )
+                    except Exception as e:
                         logger.log_operation(
-                            operation_type="edit-text-engine-fallback-success",
+                            operation_type="edit-text-engine-fallback-move-error",
                             input_file=pdf_path,
                             output_file=output_path,
-                            parameters={"engine_used": "pypdf", "font_preserved": True},
-                            status="success",
-                            notes="Fallback para pypdf preservou fontes com sucesso"
+                            parameters={"error": str(e)},
+                            status="warning",
+                            notes=f"Erro ao mover arquivo do pypdf: {str(e)}"
                         )
-                except Exception as e:
+                elif not pypdf_result.success:
+                    # Log de falha do pypdf
                     logger.log_operation(
-                        operation_type="edit-text-engine-fallback-move-error",
+                        operation_type="edit-text-fallback-failed",
                         input_file=pdf_path,
                         output_file=output_path,
-                        parameters={"error": str(e)},
+                        parameters={"fallback_attempted": True, "engine": "pypdf"},
+                        result={"success": False, "error": pypdf_result.error},
                         status="warning",
-                        notes=f"Erro ao mover arquivo do pypdf: {str(e)}"
+                        notes=f"Fallback para pypdf falhou: {pypdf_result.error}"
                     )
-            elif not pypdf_result.success:
-                # Log de falha do pypdf
-                logger.log_operation(
-                    operation_type="edit-text-fallback-failed",
-                    input_file=pdf_path,
-                    output_file=output_path,
-                    parameters={"fallback_attempted": True, "engine": "pypdf"},
-                    result={"success": False, "error": pypdf_result.error},
-                    status="warning",
-                    notes=f"Fallback para pypdf falhou: {pypdf_result.error}"
-                )
-                # Limpar arquivo temporário do pypdf se existir
-                try:
-                    if Path(f"{output_path}.pypdf").exists():
-                        Path(f"{output_path}.pypdf").unlink()
-                except:
-                    pass
-    except Exception as e:
-        # Se houver erro na detecção, continuar sem fallback
-        logger.log_operation(
-            operation_type="edit-text-font-detection",
-            input_file=pdf_path,
-            output_file=output_path,
-            parameters={"error": str(e)},
-            status="warning",
-            notes=f"Erro ao detectar fallback de fonte: {str(e)}"
-        )
+                    # Limpar arquivo temporário do pypdf se existir
+                    try:
+                        if os.path.exists(pypdf_output_path):
+                            os.unlink(pypdf_output_path)
+                    except OSError:
+                        pass
+        except Exception as e:
+            # Se houver erro na detecção, continuar sem fallback
+            logger.log_operation(
+                operation_type="edit-text-font-detection",
+                input_file=pdf_path,
+                output_file=output_path,
+                parameters={"error": str(e)},
+                status="warning",
+                notes=f"Erro ao detectar fallback de fonte: {str(e)}"
+            )
 
     # Log da operação principal
     logger.log_operation(
@@ -933,29 +1067,28 @@ def _edit_text_all_occurrences(
             "color": color,
             "rotation": rotation
         },
-        result={
+        # Montado apenas se o logger estiver habilitado (to_dict percorre
+        # todas as comparações de fonte)
+        result=lambda: {
             "status": "success",
             "occurrences_processed": occurrences_processed,
-            "occurrences_details": occurrences_details,
+            "occurrences_details": occurrences_details_dicts,
             "engine_results": [r.to_dict() for r in engine_results] if engine_results else [],
             "backup": backup_path
         },
-        notes=f"Processadas {occurrences_processed} ocorrências do texto '{search_term}'"
+        notes=lambda: f"Processadas {occurrences_processed} ocorrências do texto '{search_term}'"
     )
 
     # Criar log de auditoria (Fase 5)
+    # Gravado em arquivo separado, uma tentativa de engine por vez
     if engine_results:
-        audit_log = create_audit_log(
+        write_audit_log(
+            log_dir="logs",
             pdf_path=pdf_path,
             output_path=output_path,
             engine_results=engine_results,
             operation_type="edit-text-all-occurrences"
         )
-        # Salvar log de auditoria em arquivo separado
-        audit_log_path = Path("logs") / f"audit_{audit_log['operation_id']}.json"
-        audit_log_path.parent.mkdir(exist_ok=True)
-        with open(audit_log_path, "w", encoding="utf-8") as f:
-            json.dump(audit_log, f, ensure_ascii=False, indent=2)
 
     # Verificar se deve bloquear operação em modo strict
     if strict_fonts and font_manager.should_block_operation(strict_mode=True):
@@ -976,7 +1109,7 @@ def _edit_text_all_occurrences(
 
     details_dict = {
         "occurrences_processed": occurrences_processed,
-        "details": occurrences_details,
+        "details": occurrences_details_dicts,
         "total_occurrences": len(occurrences_details),
         "engine_used": engine_results[-1].engine.value if engine_results else "pymupdf",
         "font_fallback_detected": any(r.any_font_fallback for r in engine_results) if engine_results else False,
@@ -1004,7 +1137,8 @@ def edit_text(
     all_occurrences: bool = False,
     prefer_engine: str = "pymupdf",
     feedback_callback: Optional[Callable] = None,
-    strict_fonts: bool = False
+    strict_fonts: bool = False,
+    fast_save: bool = True
 ) -> Union[str, Tuple[str, Dict[str, Any]]]:
     """
     Edita um objeto de texto no PDF.
@@ -1029,6 +1163,9 @@ def edit_text(
         rotation: Nova rotação em graus.
         create_backup: Se True, cria backup antes de modificar.
         all_occurrences: Se True, substitui todas as ocorrências encontradas (apenas com content/search_content).
+        fast_save: Se True e a saída for o próprio arquivo de entrada, salva de
+            forma incremental quando o MuPDF permitir. Edições que removem texto
+            (redactions) sempre reescrevem o PDF, sem manter o texto antigo.
 
     Returns:
         str: Caminho do PDF modificado.
@@ -1040,12 +1177,6 @@ def edit_text(
     logger = get_logger()
     search_term = content or search_content
 
-    # Criar backup se solicitado
-    backup_path = None
-    if create_backup:
-        with PDFRepository(pdf_path) as repo:
-            backup_path = repo.create_backup()
-
     # Se all_occurrences está ativo e search_term foi fornecido, processar todas as ocorrências
     if all_occurrences and search_term and not object_id:
         result_path, occurrences_details_dict = _edit_text_all_occurrences(
@@ -1059,7 +1190,7 @@ def edit_text(
             font_size=font_size,
             color=color,
             rotation=rotation,
-            create_backup=False,  # Já criamos o backup acima
+            create_backup=create_backup,  # Backup feito no mesmo repositório da edição
             prefer_engine=prefer_engine,
             feedback_callback=feedback_callback,
             strict_fonts=strict_fonts
@@ -1072,17 +1203,19 @@ def edit_text(
         }
         return result_path, details
 
+    # Backup, extração e edição num único repositório
+    backup_path = None
     with PDFRepository(pdf_path) as repo:
-        # Extrair textos
-        text_objects = repo.extract_text_objects()
+        if _backup_needed(create_backup, pdf_path, output_path):
+            backup_path = repo.create_backup()
+
+        # Extrair textos (com índice por ID)
+        text_objects, text_by_id, _ = repo.extract_text_objects_indexed()
 
         # Encontrar objeto a editar
         target_obj = None
         if object_id:
-            for obj in text_objects:
-                if obj.id == object_id:
-                    target_obj = obj
-                    break
+            target_obj = text_by_id.get(object_id)
         elif search_term:
             for obj in text_objects:
                 # Busca por substring - se encontrar, usar o texto completo como base
@@ -1104,9 +1237,17 @@ def edit_text(
         if new_content:
             # IMPORTANTE: Se o search_term é uma substring do texto original,
             # substituir APENAS a parte correspondente, preservando o resto do texto
-            if search_term and search_term.strip() and search_term in original_content and search_term != original_content:
+            # (uma única busca + fatiamento, em vez de 'in' seguido de replace)
+            match_pos = -1
+            if search_term and search_term.strip() and search_term != original_content:
+                match_pos = original_content.find(search_term)
+            if match_pos >= 0:
                 # Substituição parcial: preservar o texto original, substituindo apenas a substring encontrada
-                target_obj.content = original_content.replace(search_term, new_content, 1)
+                target_obj.content = (
+                    original_content[:match_pos]
+                    + new_content
+                    + original_content[match_pos + len(search_term):]
+                )
                 # Usar o conteúdo parcial substituído para as próximas operações (pad, etc.)
                 final_content_for_ops = target_obj.content
             else:
@@ -1158,20 +1299,17 @@ def edit_text(
         final_y = target_obj.y if y is None else y
 
         # Converter cor hex para RGB (formato PyMuPDF)
-        color_rgb = (0, 0, 0)  # Preto padrão
-        if color:
-            hex_color = color.lstrip("#")
-            if len(hex_color) == 6:
-                color_rgb = tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+        color_rgb = _hex_to_rgb(color)  # Preto padrão se não informada
 
         # Determinar fonte e tamanho
         final_font = target_obj.font_name if not font_name else font_name
         final_font_size = target_obj.font_size if font_size is None else font_size
 
         # Buscar e remover texto antigo usando redaction
-        bbox = fitz.Rect(target_obj.x, target_obj.y, target_obj.x + target_obj.width, target_obj.y + target_obj.height)
+        bbox = _bbox_rect(target_obj)
         page.add_redact_annot(bbox, fill=(1, 1, 1))  # Preencher com branco
         page.apply_redactions()
+        repo.invalidate_text_cache()
 
         # Inserir novo texto
         # Determinar alinhamento
@@ -1189,46 +1327,13 @@ def edit_text(
 
         # Tentar carregar fonte original, com fallback para fontes padrão similares
         # PyMuPDF não consegue carregar todas as fontes do sistema, então tentamos fontes padrão similares
-        font_loaded = None
-
-        # Mapear fontes comuns para fontes padrão do PyMuPDF
-        font_mapping = {
-            "ArialMT": "helv",
-            "Arial": "helv",
-            "ArialNarrow": "helv",
-            "ArialNarrow-Bold": "hebo",  # Helvetica-Bold
-            "Times": "tiro",
-            "Times-Roman": "tiro",
-            "Courier": "cour",
-        }
-
-        # Tentar usar mapeamento primeiro
-        mapped_font = font_mapping.get(final_font) if final_font else None
-        if mapped_font:
-            try:
-                font_loaded = fitz.Font(mapped_font)
-            except:
-                pass
-
-        # Se não funcionou, tentar fonte original
-        if font_loaded is None and final_font:
-            try:
-                font_loaded = fitz.Font(final_font)
-            except:
-                pass
-
-        # Fallback final para helv (Helvetica)
-        if font_loaded is None:
-            font_loaded = fitz.Font("helv")
+        # (mapeamento primeiro, depois a fonte original, por fim helv)
+        font_loaded = _get_font(_FONT_MAPPING.get(final_font.lower(), final_font) if final_font else "helv")
 
         # Para fontes em negrito, tentar usar versão bold se disponível
         fontname_to_use = font_loaded.name
         if final_font and "bold" in final_font.lower() and "hebo" not in fontname_to_use.lower():
-            try:
-                bold_font = fitz.Font("hebo")  # Helvetica-Bold
-                fontname_to_use = bold_font.name
-            except:
-                pass  # Usar fonte normal se bold não disponível
+            fontname_to_use = _get_font("hebo").name  # Helvetica-Bold
 
         page.insert_text(
             point=(final_x, final_y + final_font_size),  # Ajustar Y para baseline
@@ -1239,8 +1344,9 @@ def edit_text(
             rotate=target_obj.rotation if rotation is None else rotation
         )
 
-        # Salvar PDF modificado
-        doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
+        # Salvar PDF modificado (após redactions o PDF é sempre reescrito,
+        # para que o texto substituído não permaneça em revisões anteriores)
+        pending_path = _save(doc, pdf_path, output_path, incremental=fast_save)
         # Não fechar manualmente - o context manager fará isso
 
         after_state = target_obj.to_dict()
@@ -1265,6 +1371,9 @@ def edit_text(
             notes="Modificação de texto realizada."
         )
 
+    if pending_path:
+        os.replace(pending_path, output_path)
+
     return output_path
 
 
@@ -1299,7 +1408,7 @@ def edit_table(
     logger = get_logger()
 
     backup_path = None
-    if create_backup:
+    if _backup_needed(create_backup, pdf_path, output_path):
         with PDFRepository(pdf_path) as repo:
             backup_path = repo.create_backup()
 
@@ -1360,12 +1469,12 @@ def replace_image(
     if not Path(src).exists():
         raise PDFFileNotFoundError(src)
 
-    if create_backup:
-        with PDFRepository(pdf_path) as repo:
+    # Implementar substituição real de imagem (backup no mesmo repositório)
+    backup_path = None
+    with PDFRepository(pdf_path) as repo:
+        if _backup_needed(create_backup, pdf_path, output_path):
             backup_path = repo.create_backup()
 
-    # Implementar substituição real de imagem
-    with PDFRepository(pdf_path) as repo:
         # Extrair imagens para encontrar a que será substituída
         image_objects = repo.extract_image_objects()
 
@@ -1382,68 +1491,58 @@ def replace_image(
         doc = repo.open()
         page = doc[target_image.page]
 
-        # Buscar a imagem no PDF para remover
-        image_list = page.get_images()
-        xref_to_remove = None
-
-        for img_index, img in enumerate(image_list):
-            xref = img[0]
-            image_rects = page.get_image_rects(xref)
-            for rect in image_rects:
-                if abs(rect.x0 - target_image.x) < 1 and abs(rect.y0 - target_image.y) < 1:
-                    xref_to_remove = xref
-                    break
-            if xref_to_remove:
-                break
+        # Buscar a imagem no PDF para remover: cada xref é consultado uma
+        # única vez (get_images pode repeti-lo) e a busca para no primeiro
+        # retângulo que coincide com a posição da imagem
+        unique_xrefs = dict.fromkeys(img[0] for img in page.get_images())
+        target_x, target_y = target_image.x, target_image.y
+        xref_to_remove = next(
+            (
+                xref
+                for xref in unique_xrefs
+                for rect in page.get_image_rects(xref)
+                if -1 < rect.x0 - target_x < 1 and -1 < rect.y0 - target_y < 1
+            ),
+            None
+        )
 
         # Remover imagem antiga usando redaction
         if xref_to_remove:
-            bbox = fitz.Rect(target_image.x, target_image.y,
-                           target_image.x + target_image.width,
-                           target_image.y + target_image.height)
+            bbox = _bbox_rect(target_image)
             page.add_redact_annot(bbox, fill=(1, 1, 1))
             page.apply_redactions()
 
         # Inserir nova imagem
-        rect = fitz.Rect(target_image.x, target_image.y,
-                        target_image.x + target_image.width,
-                        target_image.y + target_image.height)
+        rect = _bbox_rect(target_image)
 
-        # Aplicar filtro se especificado
+        # Aplicar filtro se especificado (sem Pillow disponível, insere sem filtro)
         img_data = Path(src).read_bytes()
-        if filter_type == "grayscale":
-            # Converter para grayscale usando PIL
-            try:
-                from PIL import Image as PILImage
-                import io
-                img = PILImage.open(io.BytesIO(img_data))
+        if PIL_AVAILABLE and filter_type in ("grayscale", "invert"):
+            img = PILImage.open(io.BytesIO(img_data))
+            # Formato de origem guardado antes de qualquer conversão
+            # (imagens convertidas perdem img.format)
+            source_format = img.format or "PNG"
+            filtered = None
+            if filter_type == "grayscale":
+                # Imagem já em tons de cinza: usar os bytes originais sem decodificar
                 if img.mode != "L":
-                    img = img.convert("L")
+                    filtered = img.convert("L")
+            elif img.mode in ("RGB", "L"):
+                # Inversão via tabela (LUT) aplicada em C, numa única passada
+                filtered = ImageOps.invert(img)
+            if filtered is not None:
+                # Regravar no formato original: JPEG continua JPEG (sem
+                # reencodar em PNG, mais lento e maior no PDF final)
+                save_options = {"quality": 90} if source_format == "JPEG" else {}
                 img_io = io.BytesIO()
-                img.save(img_io, format=img.format if hasattr(img, 'format') else 'PNG')
+                filtered.save(img_io, format=source_format, **save_options)
                 img_data = img_io.getvalue()
-            except ImportError:
-                pass  # Se PIL não disponível, insere sem filtro
-        elif filter_type == "invert":
-            try:
-                from PIL import Image as PILImage
-                import io
-                img = PILImage.open(io.BytesIO(img_data))
-                if img.mode == "RGB":
-                    img = img.point(lambda x: 255 - x)
-                elif img.mode == "L":
-                    img = img.point(lambda x: 255 - x)
-                img_io = io.BytesIO()
-                img.save(img_io, format=img.format if hasattr(img, 'format') else 'PNG')
-                img_data = img_io.getvalue()
-            except ImportError:
-                pass
 
         # Inserir imagem
         page.insert_image(rect, stream=img_data)
 
-        doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
-        doc.close()
+        doc.save(output_path, **_SAVE_OPTS)
+        # O context manager fecha o documento ao sair do bloco 'with'
 
     logger.log_operation(
         operation_type="replace-image",
@@ -1492,12 +1591,14 @@ def insert_object(
     if isinstance(params, str):
         params = json.loads(params)
 
-    if create_backup:
-        with PDFRepository(pdf_path) as repo:
+    # Backup e edição no mesmo repositório: o backup é cópia de bytes e
+    # o PDF é aberto (parse do xref) uma única vez
+    backup_path = None
+    with PDFRepository(pdf_path) as repo:
+        if _backup_needed(create_backup, pdf_path, output_path):
             backup_path = repo.create_backup()
 
-    # Validar campos obrigatórios conforme tipo e inserir objeto real
-    with PDFRepository(pdf_path) as repo:
+        # Validar campos obrigatórios conforme tipo e inserir objeto real
         doc = repo.open()
 
         if obj_type == "text":
@@ -1521,23 +1622,17 @@ def insert_object(
             rotation = params.get("rotation", 0.0)
 
             # Converter cor hex para RGB
-            color_rgb = (0, 0, 0)
-            hex_color = color.lstrip("#")
-            if len(hex_color) == 6:
-                color_rgb = tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+            color_rgb = _hex_to_rgb(color)
 
-            # Carregar fonte
-            try:
-                font = fitz.Font(font_name)
-            except:
-                font = fitz.Font("helv")
+            # Carregar fonte (Base-14 dispensa o fitz.Font: basta o nome curto)
+            fontname_to_use = _resolve_fontname(font_name)
 
             # Inserir texto
             page.insert_text(
                 point=(x, y + font_size),
                 text=content,
                 fontsize=font_size,
-                fontname=font.name,
+                fontname=fontname_to_use,
                 color=color_rgb,
                 rotate=rotation
             )
@@ -1564,8 +1659,8 @@ def insert_object(
             height = params.get("height", 100.0)
 
             rect = fitz.Rect(x, y, x + width, y + height)
-            img_data = Path(img_src).read_bytes()
-            page.insert_image(rect, stream=img_data)
+            # MuPDF lê o arquivo diretamente, sem manter uma cópia em bytes no Python
+            page.insert_image(rect, filename=str(img_src))
 
         else:
             # Outros tipos (table, link, etc.) requerem implementação mais complexa
@@ -1575,14 +1670,16 @@ def insert_object(
 
             # Outros tipos (table, link, graphic, etc.) requerem implementação específica
             # para cada tipo. Por enquanto, apenas text e image estão totalmente implementados.
-            doc.close()
             raise NotImplementedError(
                 f"Inserção de objetos do tipo '{obj_type}' ainda não está implementada. "
                 f"Tipos suportados: text, image"
             )
 
-        doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
-        doc.close()
+        pending_path = _save(doc, pdf_path, output_path)
+        # O context manager fecha o documento ao sair do bloco 'with'
+
+    if pending_path:
+        os.replace(pending_path, output_path)
 
     logger.log_operation(
         operation_type="insert-object",
@@ -1624,24 +1721,28 @@ def restore_from_json(
     """
     logger = get_logger()
 
-    # Validar JSON
-    with open(json_file, "r", encoding="utf-8") as f:
-        changes = json.load(f)
+    # Ler JSON (JSONs grandes são lidos página a página, via streaming)
+    page_items = _iter_restore_pages(json_file)
+    pages_count = 0
 
-    if create_backup:
-        with PDFRepository(source_pdf) as repo:
+    # Implementar aplicação de alterações do JSON (backup no mesmo repositório)
+    backup_path = None
+    with PDFRepository(source_pdf) as repo:
+        if _backup_needed(create_backup, source_pdf, output_path):
             backup_path = repo.create_backup()
 
-    # Implementar aplicação de alterações do JSON
-    with PDFRepository(source_pdf) as repo:
         doc = repo.open()
 
-        # Validar estrutura do JSON
-        if not isinstance(changes, dict):
-            raise ValueError("JSON deve ser um dicionário agrupado por página")
+        # Extrair textos uma única vez (IDs do PDF original, como exportados)
+        # em vez de reler o documento inteiro a cada objeto do JSON
+        _, text_by_id, _ = repo.extract_text_objects_indexed()
 
-        # Processar cada página
-        for page_num_str, page_objects in changes.items():
+        # Processar cada página (sequencialmente: documentos PyMuPDF não são
+        # thread-safe, e dividir o PDF entre processos para depois remontá-lo
+        # com insert_pdf perderia estrutura do documento, como formulários,
+        # outlines e metadados)
+        for page_num_str, page_objects in page_items:
+            pages_count += 1
             try:
                 page_num = int(page_num_str)
             except ValueError:
@@ -1651,6 +1752,11 @@ def restore_from_json(
                 continue
 
             page = doc[page_num]
+            # Textos da página são acumulados e gravados num único Shape após
+            # as remoções, com um só commit no content stream por página.
+            # (inserir antes de aplicar redactions faria o MuPDF descartar os
+            # recursos de fonte ainda não referenciados pelo conteúdo)
+            pending_texts = []
 
             # Processar objetos por tipo
             for obj_type, objects in page_objects.items():
@@ -1664,43 +1770,49 @@ def restore_from_json(
                         new_content = obj_data.get("content")
                         if obj_id and new_content:
                             # Buscar e editar texto
-                            text_objects = repo.extract_text_objects()
-                            for text_obj in text_objects:
-                                if text_obj.id == obj_id and text_obj.page == page_num:
-                                    # Editar texto
-                                    bbox = fitz.Rect(text_obj.x, text_obj.y,
-                                                   text_obj.x + text_obj.width,
-                                                   text_obj.y + text_obj.height)
-                                    page.add_redact_annot(bbox, fill=(1, 1, 1))
-                                    page.apply_redactions()
-
-                                    color_rgb = (0, 0, 0)
-                                    color_hex = obj_data.get("color", "#000000").lstrip("#")
-                                    if len(color_hex) == 6:
-                                        color_rgb = tuple(int(color_hex[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-
-                                    font_size = obj_data.get("font_size", text_obj.font_size)
-                                    try:
-                                        font = fitz.Font(obj_data.get("font_name", text_obj.font_name) or "helv")
-                                    except:
-                                        font = fitz.Font("helv")
-
-                                    page.insert_text(
-                                        point=(text_obj.x, text_obj.y + font_size),
-                                        text=new_content,
-                                        fontsize=font_size,
-                                        fontname=font.name,
-                                        color=color_rgb
-                                    )
-                                    break
+                            text_obj = text_by_id.get(obj_id)
+                            if text_obj is not None and text_obj.page == page_num:
+                                # Editar texto
+                                bbox = _bbox_rect(text_obj)
+                                page.add_redact_annot(bbox, fill=(1, 1, 1))
+
+                                color_rgb = _hex_to_rgb(obj_data.get("color", "#000000"))
+
+                                font_size = obj_data.get("font_size", text_obj.font_size)
+                                requested_font = obj_data.get("font_name", text_obj.font_name) or "helv"
+                                fontname_to_use = _resolve_fontname(requested_font)
+
+                                pending_texts.append((
+                                    (text_obj.x, text_obj.y + font_size),
+                                    new_content,
+                                    font_size,
+                                    fontname_to_use,
+                                    color_rgb
+                                ))
 
                     elif obj_type == "image":
                         # Restore de imagens via JSON pode ser feito usando replace_image()
                         # se necessário. Por enquanto, restore-from-json foca em textos.
                         pass
 
-        doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
-        doc.close()
+            if pending_texts:
+                # Aplicar todas as remoções da página de uma só vez
+                page.apply_redactions()
+                repo.invalidate_text_cache()
+
+                shape = page.new_shape()
+                for point, text, fontsize, fontname, color_rgb in pending_texts:
+                    shape.insert_text(
+                        point,
+                        text,
+                        fontsize=fontsize,
+                        fontname=fontname,
+                        color=color_rgb
+                    )
+                shape.commit(overlay=True)
+
+        doc.save(output_path, **_SAVE_OPTS)
+        # O context manager fecha o documento ao sair do bloco 'with'
 
     logger.log_operation(
         operation_type="restore-from-json",
@@ -1708,7 +1820,7 @@ def restore_from_json(
         output_file=output_path,
         parameters={"json_file": json_file},
         result={
-            "changes_count": len(changes) if isinstance(changes, list) else 1,
+            "changes_count": pages_count,
             "status": "success",
             "backup": backup_path
         }
@@ -1722,8 +1834,8 @@ def restore_from_json(
 # ============================================================================
 
 def edit_metadata(
-    pdf_path: str,
-    output_path: str,
+    pdf_path: Union[str, os.PathLike],
+    output_path: Union[str, os.PathLike],
     title: Optional[str] = None,
     author: Optional[str] = None,
     subject: Optional[str] = None,
@@ -1753,42 +1865,60 @@ def edit_metadata(
     """
     logger = get_logger()
 
-    if create_backup:
+    # Caminhos normalizados para str uma única vez (aceita PathLike)
+    pdf_path = os.fspath(pdf_path)
+    output_path = os.fspath(output_path)
+
+    # Montar alterações antes de abrir o documento (apenas campos informados)
+    values = (title, author, subject, keywords, creator, producer)
+    new_metadata = {key: value for key, value in zip(_EDITABLE_METADATA_KEYS, values) if value}
+
+    # Nada a alterar: copia o arquivo (ou não faz nada se saída == entrada)
+    # sem fazer backup ou reserializar o PDF
+    if not new_metadata:
+        # Abrir pelo repositório valida existência e formato antes da cópia
         with PDFRepository(pdf_path) as repo:
-            backup_path = repo.create_backup()
+            if not repo.open().is_pdf:
+                raise PDFMalformedError(pdf_path, "Arquivo não é um PDF")
+        if Path(pdf_path).resolve() != Path(output_path).resolve():
+            shutil.copy2(pdf_path, output_path)
+        logger.log_operation(
+            operation_type="edit-metadata",
+            input_file=pdf_path,
+            output_file=output_path,
+            parameters=new_metadata,
+            result={"changed": False, "backup": None},
+            notes="Nenhum metadado informado; PDF não foi reescrito"
+        )
+        return output_path
 
+    backup_path = None
     with PDFRepository(pdf_path) as repo:
-        # Obter metadados atuais
-        current_metadata = repo.get_metadata()
-        before_metadata = current_metadata.copy()
-
-        # Aplicar alterações
-        new_metadata = {}
-        if title:
-            new_metadata["title"] = title
-        if author:
-            new_metadata["author"] = author
-        if subject:
-            new_metadata["subject"] = subject
-        if keywords:
-            new_metadata["keywords"] = keywords
-        if creator:
-            new_metadata["creator"] = creator
-        if producer:
-            new_metadata["producer"] = producer
+        if create_backup:
+            backup_path = repo.create_backup()
+
+        # Metadados atuais (apenas os campos editáveis) só servem ao log
+        before_metadata = None
+        if logger.is_enabled():
+            current_metadata = repo.get_metadata()
+            before_metadata = {key: current_metadata.get(key, "") for key in _EDITABLE_METADATA_KEYS}
 
         # Atualizar metadados
         repo.set_metadata(new_metadata)
-        repo.save(output_path)
+        pending_path = _save(repo.open(), pdf_path, output_path)
+
+    if pending_path:
+        os.replace(pending_path, output_path)
 
     logger.log_operation(
         operation_type="edit-metadata",
         input_file=pdf_path,
         output_file=output_path,
         parameters=new_metadata,
-        result={
+        result=lambda: {
             "before": before_metadata,
-            "after": new_metadata
+            "after": new_metadata,
+            "backup": backup_path
         }
     )
 
@@ -1799,7 +1929,11 @@ def edit_metadata(
 # MANIPULAÇÃO ESTRUTURAL
 # ============================================================================
 
-def merge_pdf(pdf_paths: List[str], output_path: str) -> str:
+def merge_pdf(
+    pdf_paths: List[Union[str, os.PathLike]],
+    output_path: Union[str, os.PathLike],
+    dedupe: bool = True
+) -> str:
     """
     Une múltiplos arquivos PDF em um único documento.
 
@@ -1808,6 +1942,8 @@ def merge_pdf(pdf_paths: List[str], output_path: str) -> str:
     Args:
         pdf_paths: Lista de caminhos para os PDFs a serem unidos.
         output_path: Caminho de saída para o PDF resultante.
+        dedupe: Se True, recursos idênticos (fontes, imagens) vindos de PDFs
+            diferentes são compartilhados em vez de embutidos várias vezes.
 
     Returns:
         str: Caminho do PDF resultante.
@@ -1820,11 +1956,17 @@ def merge_pdf(pdf_paths: List[str], output_path: str) -> str:
     if not pdf_paths:
         raise ValueError("Lista de PDFs vazia")
 
+    # Caminhos normalizados para str uma única vez (aceita PathLike)
+    pdf_paths = [os.fspath(path) for path in pdf_paths]
+    output_path = os.fspath(output_path)
+
     # Usar o primeiro PDF como base e incluir todos na união
     base_repo = PDFRepository(pdf_paths[0])
     merged_doc = base_repo.merge_pdfs(pdf_paths)
 
-    merged_doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
+    # garbage=4 faz o MuPDF comparar objetos (inclusive streams) e reapontar
+    # referências duplicadas para uma única cópia canônica
+    merged_doc.save(output_path, **dict(_SAVE_OPTS, garbage=4 if dedupe else 3))
     merged_doc.close()
     base_repo.close()
 
@@ -1832,7 +1974,7 @@ def merge_pdf(pdf_paths: List[str], output_path: str) -> str:
         operation_type="merge",
         input_file=",".join(pdf_paths),
         output_file=output_path,
-        parameters={"pdf_count": len(pdf_paths)},
+        parameters={"pdf_count": len(pdf_paths), "dedupe": dedupe},
         result={"status": "success"}
     )
 
@@ -1840,9 +1982,9 @@ def merge_pdf(pdf_paths: List[str], output_path: str) -> str:
 
 
 def delete_pages(
-    pdf_path: str,
+    pdf_path: Union[str, os.PathLike],
     page_numbers: List[int],
-    output_path: Optional[str] = None,
+    output_path: Optional[Union[str, os.PathLike]] = None,
     create_backup: bool = True
 ) -> str:
     """
@@ -1864,36 +2006,45 @@ def delete_pages(
     """
     logger = get_logger()
 
-    # Converter de 1-indexed para 0-indexed (CLI usa 1-indexed)
-    page_numbers_0indexed = [p - 1 for p in page_numbers if p > 0]
+    # Caminhos normalizados para str uma única vez (aceita PathLike)
+    pdf_path = os.fspath(pdf_path)
 
-    if output_path is None:
-        output_path = str(pdf_path)
+    # Converter de 1-indexed para 0-indexed (CLI usa 1-indexed), sem repetições
+    page_numbers_0indexed = sorted({p - 1 for p in page_numbers if p > 0})
 
-    if create_backup:
-        with PDFRepository(pdf_path) as repo:
-            backup_path = repo.create_backup()
+    output_path = pdf_path if output_path is None else os.fspath(output_path)
 
+    backup_path = None
     with PDFRepository(pdf_path) as repo:
+        if create_backup:
+            backup_path = repo.create_backup()
+
         modified_doc = repo.delete_pages(page_numbers_0indexed)
-        modified_doc.save(output_path, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
-        modified_doc.close()
+
+        # Reescrita completa (páginas excluídas não ficam em revisões antigas
+        # do arquivo); sobre o próprio arquivo, via temporário após fechá-lo
+        overwrite = Path(output_path).resolve() == Path(pdf_path).resolve()
+        save_path = f"{output_path}.tmp" if overwrite else output_path
+        modified_doc.save(save_path, **_SAVE_OPTS)
+
+    if overwrite:
+        os.replace(save_path, output_path)
 
     logger.log_operation(
         operation_type="delete-pages",
         input_file=pdf_path,
         output_file=output_path,
         parameters={"pages": page_numbers},
-        result={"pages_deleted": len(page_numbers)}
+        result={"pages_deleted": len(page_numbers_0indexed), "backup": backup_path}
     )
 
     return output_path
 
 
 def split_pdf(
-    pdf_path: str,
+    pdf_path: Union[str, os.PathLike],
     ranges: List[tuple],
-    output_prefix: str,
+    output_prefix: Union[str, os.PathLike],
     create_backup: bool = True
 ) -> List[str]:
     """
@@ -1915,29 +2066,34 @@ def split_pdf(
     """
     logger = get_logger()
 
+    # Caminhos normalizados para str uma única vez (aceita PathLike)
+    pdf_path = os.fspath(pdf_path)
+    output_prefix = os.fspath(output_prefix)
+
     # Converter de 1-indexed para 0-indexed
     ranges_0indexed = [(start - 1, end - 1) for start, end in ranges]
 
-    if create_backup:
-        with PDFRepository(pdf_path) as repo:
-            backup_path = repo.create_backup()
+    # Nomes de saída montados de uma vez, um por faixa
+    output_files = [f"{output_prefix}{i}.pdf" for i in range(1, len(ranges) + 1)]
 
-    output_files = []
+    backup_path = None
     with PDFRepository(pdf_path) as repo:
-        split_docs = repo.split_pages(ranges_0indexed)
+        if create_backup:
+            backup_path = repo.create_backup()
 
-        for i, doc in enumerate(split_docs):
-            output_file = f"{output_prefix}{i+1}.pdf"
-            doc.save(output_file, incremental=False, encryption=fitz.PDF_ENCRYPT_KEEP)
+        # Um subdocumento por vez: criado, salvo e fechado antes do próximo
+        split_docs = repo.iter_split_pages(ranges_0indexed)
+
+        for output_file, doc in zip(output_files, split_docs):
+            doc.save(output_file, **_SAVE_OPTS)
             doc.close()
-            output_files.append(output_file)
 
     logger.log_operation(
         operation_type="split",
         input_file=pdf_path,
         output_file=",".join(output_files),
         parameters={"ranges": ranges, "prefix": output_prefix},
-        result={"files_created": len(output_files)}
+        result={"files_created": len(output_files), "backup": backup_path}
     )
 
     return output_files
@@ -1947,6 +2103,233 @@ def split_pdf(
 # FUNÇÕES AUXILIARES
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def _sanitize_fontname(font_name: str) -> str:
+    """
+    Remove espaços, hífens e underscores de um nome de fonte.
+
+    PyMuPDF não aceita esses caracteres em nomes de recurso de fonte.
+
+    Args:
+        font_name: Nome original da fonte.
+
+    Returns:
+        str: Nome seguro para uso em insert_font/insert_text.
+    """
+    return font_name.replace(' ', '').replace('-', '').replace('_', '')
+
+
+def write_json(path: Union[str, Path], data: Any) -> None:
+    """
+    Grava dados em arquivo JSON (UTF-8, indentação de 2 espaços).
+
+    Usa orjson quando disponível; caso contrário, o módulo json padrão.
+
+    Args:
+        path: Caminho do arquivo de saída.
+        data: Dados serializáveis em JSON.
+    """
+    if ORJSON_AVAILABLE:
+        Path(path).write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+@lru_cache(maxsize=256)
+def _hex_to_rgb(color: Optional[str]) -> Tuple[float, float, float]:
+    """
+    Converte uma cor hexadecimal (#RRGGBB) para RGB normalizado (formato PyMuPDF).
+
+    Resultado memorizado por cor: poucas cores distintas se repetem por documento.
+
+    Args:
+        color: Cor em formato hex (com ou sem "#"). Se None ou inválida, usa preto.
+
+    Returns:
+        Tuple[float, float, float]: Componentes (r, g, b) entre 0.0 e 1.0.
+    """
+    if not color:
+        return (0, 0, 0)
+    hex_color = color.lstrip("#")
+    if not _HEX_COLOR_RE.fullmatch(hex_color):
+        return (0, 0, 0)
+    value = int(hex_color, 16)
+    return ((value >> 16) / 255.0, ((value >> 8) & 0xFF) / 255.0, (value & 0xFF) / 255.0)
+
+
+def _resolve_fontname(font_name: str) -> str:
+    """
+    Resolve o nome de fonte a ser passado para page.insert_text().
+
+    Nomes Base-14 são usados diretamente; demais nomes são carregados via
+    fitz.Font, com fallback para Helvetica se a fonte não for encontrada.
+
+    Args:
+        font_name: Nome da fonte solicitada.
+
+    Returns:
+        str: Nome da fonte utilizável pelo PyMuPDF.
+    """
+    if font_name in _BASE14_FONTS:
+        return font_name
+    return _get_font(font_name).name
+
+
+@lru_cache(maxsize=64)
+def _get_font(font_name: str) -> "fitz.Font":
+    """
+    Carrega (uma única vez por nome) um fitz.Font, com fallback para Helvetica.
+
+    Objetos fitz.Font não pertencem a nenhum documento e podem ser
+    reutilizados entre edições e PDFs.
+
+    Args:
+        font_name: Nome da fonte.
+
+    Returns:
+        fitz.Font: Fonte carregada, ou Helvetica se não for encontrada.
+    """
+    try:
+        return fitz.Font(font_name)
+    except Exception:
+        # PyMuPDF sinaliza fonte inexistente com FzErrorArgument (subclasse de Exception)
+        return fitz.Font("helv")
+
+
+def _bbox_rect(obj: Any) -> "fitz.Rect":
+    """
+    Constrói o retângulo (bounding box) de um objeto posicionado no PDF.
+
+    Args:
+        obj: Objeto com atributos x, y, width e height (TextObject, ImageObject).
+
+    Returns:
+        fitz.Rect: Retângulo (x0, y0, x1, y1) do objeto.
+    """
+    x = obj.x
+    y = obj.y
+    return fitz.Rect(x, y, x + obj.width, y + obj.height)
+
+
+# Tamanho a partir do qual o JSON de restore-from-json é lido em streaming
+_STREAM_JSON_THRESHOLD = 10 * 1024 * 1024
+
+
+def _iter_restore_pages(json_file: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Itera sobre as páginas (chave, objetos) de um JSON de restore-from-json.
+
+    JSONs acima de _STREAM_JSON_THRESHOLD são lidos em streaming com ijson
+    (se disponível), mantendo em memória apenas os objetos de uma página.
+    Os demais são carregados de uma vez com json.load.
+
+    Args:
+        json_file: Caminho do arquivo JSON agrupado por página.
+
+    Returns:
+        Iterator[Tuple[str, Any]]: Pares (número da página, objetos da página).
+
+    Raises:
+        ValueError: Se o JSON não for um dicionário agrupado por página.
+    """
+    if IJSON_AVAILABLE and os.path.getsize(json_file) > _STREAM_JSON_THRESHOLD:
+        return _stream_restore_pages(json_file)
+
+    with open(json_file, "r", encoding="utf-8") as f:
+        changes = json.load(f)
+
+    # Validar estrutura do JSON
+    if not isinstance(changes, dict):
+        raise ValueError("JSON deve ser um dicionário agrupado por página")
+    return iter(changes.items())
+
+
+def _stream_restore_pages(json_file: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Lê as páginas de um JSON grande em streaming (requer ijson).
+
+    Args:
+        json_file: Caminho do arquivo JSON agrupado por página.
+
+    Yields:
+        Tuple[str, Any]: Pares (número da página, objetos da página).
+
+    Raises:
+        ValueError: Se o JSON não for um dicionário agrupado por página.
+    """
+    with open(json_file, "rb") as f:
+        # Validar estrutura do JSON pelo primeiro evento do parser
+        _, event, _ = next(ijson.parse(f), (None, None, None))
+        if event != "start_map":
+            raise ValueError("JSON deve ser um dicionário agrupado por página")
+        f.seek(0)
+        yield from ijson.kvitems(f, "", use_float=True)
+
+
+def _backup_needed(create_backup: bool, pdf_path: str, output_path: str) -> bool:
+    """
+    Indica se uma operação de edição precisa criar backup.
+
+    Quando a saída é outro arquivo, o PDF de entrada não é alterado e já
+    serve de backup: a cópia é dispensada (o log registra backup None).
+
+    Args:
+        create_backup: Se o backup foi solicitado.
+        pdf_path: Caminho do PDF de entrada.
+        output_path: Caminho de saída.
+
+    Returns:
+        bool: True se o backup deve ser criado.
+    """
+    return create_backup and Path(output_path).resolve() == Path(pdf_path).resolve()
+
+
+def _save(
+    doc: "fitz.Document",
+    pdf_path: str,
+    output_path: str,
+    incremental: bool = True
+) -> Optional[str]:
+    """
+    Salva o documento, usando salvamento incremental quando possível.
+
+    Quando a saída é o próprio arquivo de entrada e o MuPDF permite
+    (doc.can_save_incrementally()), apenas o delta (novo xref) é anexado ao
+    final do arquivo em vez de reescrever o PDF inteiro. Após apply_redactions
+    isso nunca é permitido: a revisão anterior manteria o conteúdo removido.
+
+    Nos demais casos o PDF é reescrito por completo. Se a saída for o próprio
+    arquivo de entrada, a reescrita vai para um arquivo temporário, cujo
+    caminho é retornado: quem chama deve movê-lo para output_path com
+    os.replace depois de fechar o documento.
+
+    Args:
+        doc: Documento PyMuPDF aberto a partir de pdf_path.
+        pdf_path: Caminho do PDF de entrada.
+        output_path: Caminho de saída.
+        incremental: Se False, sempre reescreve o PDF por completo.
+
+    Returns:
+        Optional[str]: Caminho do arquivo temporário a mover, ou None.
+    """
+    source = Path(pdf_path).resolve()
+    if Path(output_path).resolve() != source:
+        doc.save(output_path, **_SAVE_OPTS)
+        return None
+
+    if incremental and doc.can_save_incrementally():
+        doc.save(output_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        return None
+
+    # O MuPDF não reescreve o arquivo de origem no lugar
+    temp_path = f"{output_path}.tmp"
+    doc.save(temp_path, **_SAVE_OPTS)
+    return temp_path
+
+
 def center_and_pad_text(text_object: TextObject, new_text: str) -> str:
     """
     Ajusta um novo texto para centralizá-lo mantendo o espaço visual original.
@@ -1964,9 +2347,14 @@ def center_and_pad_text(text_object: TextObject, new_text: str) -> str:
     Raises:
         PaddingError: Se o novo texto for maior que o espaço disponível.
     """
+    # Sem conteúdo original não há largura por caractere para estimar
+    # (objetos extraídos sempre têm conteúdo; criados manualmente podem não ter)
+    if not text_object.content:
+        return new_text
+
     # Calcular largura estimada do novo texto
     # Estimativa simples: assumir mesmo tamanho de fonte
-    char_width_estimate = text_object.width / len(text_object.content) if text_object.content else 1
+    char_width_estimate = text_object.width / len(text_object.content)
     new_width_estimate = len(new_text) * char_width_estimate
 
     if new_width_estimate > text_object.width * 1.2:  # 20% de tolerância
@@ -1979,7 +2367,8 @@ def center_and_pad_text(text_object: TextObject, new_text: str) -> str:
             suggestion="Reduza o texto ou aumente tamanho do bloco/font."
         )
 
-    # Calcular espaços para centralização
+    # Calcular espaços para centralização; com número ímpar de espaços, o
+    # espaço extra fica à direita (str.center pode colocá-lo à esquerda)
     total_chars = int(text_object.width / char_width_estimate)
     spaces_needed = total_chars - len(new_text)
     spaces_before = spaces_needed // 2
@@ -1997,16 +2386,39 @@ def parse_page_numbers(page_string: str) -> List[int]:
 
     Returns:
         List[int]: Lista de números de página (1-indexed).
+
+    Raises:
+        ValueError: Se algum trecho não for um número ou faixa válida.
     """
-    pages = []
+    # Cópia em lista: quem chama pode alterá-la sem afetar o cache
+    return list(_parse_page_numbers_cached(page_string))
+
+
+@lru_cache(maxsize=256)
+def _parse_page_numbers_cached(page_string: str) -> Tuple[int, ...]:
+    """Versão memoizada de parse_page_numbers (resultado imutável)."""
+    intervals = []
     for part in page_string.split(","):
-        part = part.strip()
-        if "-" in part:
-            start, end = map(int, part.split("-"))
+        match = _PAGE_PART_RE.fullmatch(part)
+        if match is None:
+            raise ValueError(f"Número ou faixa de páginas inválida: {part!r}")
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        if start <= end:
+            intervals.append((start, end))
+
+    # Ordenar e fundir as faixas antes de expandi-las: cada página é gerada
+    # uma única vez, já em ordem, sem set() nem sorted() sobre todas elas
+    intervals.sort()
+    pages = []
+    last = None
+    for start, end in intervals:
+        if last is not None and start <= last:
+            start = last + 1
+        if start <= end:
             pages.extend(range(start, end + 1))
-        else:
-            pages.append(int(part))
-    return sorted(set(pages))
+            last = end
+    return tuple(pages)
 
 
 def parse_page_ranges(ranges_string: str) -> List[tuple]:
@@ -2018,15 +2430,22 @@ def parse_page_ranges(ranges_string: str) -> List[tuple]:
 
     Returns:
         List[tuple]: Lista de tuplas (start, end) (1-indexed).
+
+    Raises:
+        ValueError: Se algum trecho não for um número ou faixa válida.
     """
+    return list(_parse_page_ranges_cached(ranges_string))
+
+
+@lru_cache(maxsize=256)
+def _parse_page_ranges_cached(ranges_string: str) -> Tuple[tuple, ...]:
+    """Versão memoizada de parse_page_ranges (resultado imutável)."""
     ranges = []
     for part in ranges_string.split(","):
-        part = part.strip()
-        if "-" in part:
-            start, end = map(int, part.split("-"))
-            ranges.append((start, end))
-        else:
-            # Página única
-            page = int(part)
-            ranges.append((page, page))
-    return ranges
+        match = _PAGE_PART_RE.fullmatch(part)
+        if match is None:
+            raise ValueError(f"Número ou faixa de páginas inválida: {part!r}")
+        # Página única vira a faixa (página, página)
+        start, end = match.groups()
+        ranges.append((int(start), int(end or start)))
+    return tuple(ranges)
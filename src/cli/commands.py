@@ -5,22 +5,40 @@ Este módulo contém todas as funções que implementam os comandos do CLI,
 utilizando apenas print() para saída e validando argumentos manualmente.
 """
 
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Any, Optional, List
+import os
 import sys
-import json
+import traceback
 
 # Imports dos módulos do projeto
-try:
-    from app import services
-    from core.exceptions import PDFCliException
-except ImportError:
-    import app.services as services
-    from core.exceptions import PDFCliException
+# app.services (e o PyMuPDF) é importado dentro de cada comando, para que
+# --help e comandos que não tocam em PDF não paguem o custo de carregá-lo.
+from core.exceptions import PDFCliException
+from core.font_manager import FontMatchQuality, detect_name_variants
 
 from cli.help import print_success, print_error, print_warning
 from cli.parser import get_flag_value, has_flag
 
+# Máximo de páginas listadas no resumo detalhado do export-images
+_MAX_DISPLAY_PAGES = 50
+
+# Qualidade da fonte no preview do edit-text, por (origem, nome corresponde);
+# combinações ausentes da tabela são SIMILAR
+_MATCH_QUALITY = {
+    ("extracted", True): FontMatchQuality.EXACT,
+    ("extracted", False): FontMatchQuality.EXACT,
+    ("embedded", True): FontMatchQuality.EXACT,
+    ("embedded", False): FontMatchQuality.EXACT,
+    ("system", True): FontMatchQuality.EXACT,
+    ("system", False): FontMatchQuality.VARIANT,
+    ("cache", True): FontMatchQuality.EXACT,
+    ("cache", False): FontMatchQuality.VARIANT,
+    ("fallback", True): FontMatchQuality.FALLBACK,
+    ("fallback", False): FontMatchQuality.FALLBACK,
+}
+
 
 def _validate_input_output_paths(input_path: str, output_path: str) -> None:
     """
@@ -33,16 +51,39 @@ def _validate_input_output_paths(input_path: str, output_path: str) -> None:
     Raises:
         PDFCliException: Se os caminhos forem iguais (mesmo arquivo)
     """
-    input_abs = Path(input_path).resolve()
-    output_abs = Path(output_path).resolve()
-
-    if input_abs == output_abs:
+    if input_path == output_path:
+        same = True
+    elif os.path.exists(output_path):
+        # Saída já existe: compara pelo inode (também detecta links simbólicos)
+        try:
+            same = os.path.samefile(input_path, output_path)
+        except OSError:
+            same = False
+    else:
+        # Saída ainda não existe: basta comparar os caminhos normalizados
+        same = (os.path.normcase(os.path.abspath(input_path))
+                == os.path.normcase(os.path.abspath(output_path)))
+
+    if same:
         raise PDFCliException(
             f"Erro: O arquivo de entrada e saida sao o mesmo: {input_path}\n"
             f"   Use um nome diferente para o arquivo de saida."
         )
 
 
+def _has_extension(path: str, *extensions: str) -> bool:
+    """
+    Verifica a extensão sem diferenciar maiúsculas de minúsculas.
+
+    Compara apenas o final do caminho, sem copiar o caminho inteiro em minúsculas.
+
+    Args:
+        path: Caminho do arquivo
+        extensions: Extensões aceitas, em minúsculas (ex: ".pdf")
+    """
+    return any(path[-len(ext):].lower() == ext for ext in extensions)
+
+
 def _validate_pdf_path(pdf_path: str, param_name: str = "arquivo_entrada.pdf") -> None:
     """
     Valida que o caminho PDF inclui o nome do arquivo.
@@ -51,7 +92,7 @@ def _validate_pdf_path(pdf_path: str, param_name: str = "arquivo_entrada.pdf") -
         pdf_path: Caminho do arquivo PDF
         param_name: Nome do parâmetro para mensagem de erro
     """
-    if not pdf_path.endswith('.pdf'):
+    if not _has_extension(pdf_path, '.pdf'):
         print_warning(f"O caminho {param_name} nao termina com .pdf")
         print(f"  Caminho informado: {pdf_path}")
         print(f"  Certifique-se de incluir o nome completo do arquivo, exemplo: ./doc/boleto.pdf")
@@ -61,15 +102,13 @@ def _normalize_font_name(font_name: str) -> str:
     """Normaliza o nome da fonte removendo prefixos de subset."""
     if not font_name:
         return font_name
-    if '+' in font_name:
-        parts = font_name.split('+', 1)
-        if len(parts) > 1:
-            return parts[1]
-    return font_name
+    _, sep, tail = font_name.partition('+')
+    return tail if sep else font_name
 
 
 def cmd_export_text(args: Dict[str, Any]) -> int:
     """Comando export-text: Extrai apenas textos do PDF para JSON."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -85,10 +124,9 @@ def cmd_export_text(args: Dict[str, Any]) -> int:
         _validate_pdf_path(pdf_path)
         _validate_input_output_paths(pdf_path, output)
 
-        # Processar flags
-        verbose = has_flag(args, 'verbose', 'l')
-
         # Executar
+        from app import services
+
         stats = services.export_objects(pdf_path, output, types=["text"], include_fonts=False)
 
         print_success("Textos exportados com sucesso")
@@ -109,14 +147,14 @@ def cmd_export_text(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
 
 def cmd_export_objects(args: Dict[str, Any]) -> int:
     """Comando export-objects: Extrai objetos do PDF para JSON."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -140,9 +178,10 @@ def cmd_export_objects(args: Dict[str, Any]) -> int:
 
         # Processar flags
         include_fonts = has_flag(args, 'include-fonts')
-        verbose = has_flag(args, 'verbose', 'l')
 
         # Executar
+        from app import services
+
         stats = services.export_objects(pdf_path, output, types, include_fonts)
 
         print_success("Objetos exportados com sucesso")
@@ -166,14 +205,14 @@ def cmd_export_objects(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
 
 def cmd_export_images(args: Dict[str, Any]) -> int:
     """Comando export-images: Extrai imagens do PDF como arquivos PNG/JPG."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -196,10 +235,9 @@ def cmd_export_images(args: Dict[str, Any]) -> int:
             print_error(f"Formato invalido: {format_str}. Use 'png' ou 'jpg'.")
             return 1
 
-        # Processar flags
-        verbose = has_flag(args, 'verbose', 'l')
-
         # Executar
+        from app import services
+
         stats = services.export_images(pdf_path, output_dir, format=format_str)
 
         print_success("Imagens exportadas com sucesso")
@@ -207,18 +245,22 @@ def cmd_export_images(args: Dict[str, Any]) -> int:
         print(f"  Total de imagens: {stats['total_images']}")
 
         if verbose:
-            print()
-            print("  Por pagina:")
-            for page, count in sorted(stats['by_page'].items()):
-                print(f"    Pagina {page}: {count} imagem(ns)")
+            # Linhas acumuladas e escritas de uma só vez; listas longas são truncadas
+            by_page = sorted(stats['by_page'].items())
+            lines = ["", "  Por pagina:"]
+            for page, count in by_page[:_MAX_DISPLAY_PAGES]:
+                lines.append(f"    Pagina {page}: {count} imagem(ns)")
+            if len(by_page) > _MAX_DISPLAY_PAGES:
+                lines.append(f"    ... (+{len(by_page)-_MAX_DISPLAY_PAGES} paginas mais)")
 
             if stats['saved_files']:
-                print()
-                print("  Arquivos salvos:")
+                lines.append("")
+                lines.append("  Arquivos salvos:")
                 for img in stats['saved_files'][:10]:
-                    print(f"    - {img['filename']} ({img['width']}x{img['height']}px, pagina {img['page']})")
+                    lines.append(f"    - {img['filename']} ({img['width']}x{img['height']}px, pagina {img['page']})")
                 if len(stats['saved_files']) > 10:
-                    print(f"    ... (+{len(stats['saved_files'])-10} mais)")
+                    lines.append(f"    ... (+{len(stats['saved_files'])-10} mais)")
+            print("\n".join(lines))
 
         return 0
 
@@ -227,14 +269,14 @@ def cmd_export_images(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
 
 def cmd_list_fonts(args: Dict[str, Any]) -> int:
     """Comando list-fonts: Lista todas as fontes e variantes usadas no PDF."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 1:
@@ -254,113 +296,102 @@ def cmd_list_fonts(args: Dict[str, Any]) -> int:
             fonts_dict = repo.extract_fonts()
             text_objects = repo.extract_text_objects()
 
-            # Estatísticas de uso por fonte
-            font_stats = {}
-            for text_obj in text_objects:
-                font_name = text_obj.font_name
-                normalized_name = _normalize_font_name(font_name)
-                if normalized_name not in font_stats:
-                    font_stats[normalized_name] = {
-                        "name": normalized_name,
-                        "pages": set(),
-                        "sizes": set(),
-                        "occurrences": 0
-                    }
-                font_stats[normalized_name]["pages"].add(text_obj.page)
-                font_stats[normalized_name]["sizes"].add(text_obj.font_size)
-                font_stats[normalized_name]["occurrences"] += 1
-
-            # Preparar dados para exibição
-            fonts_info = []
-            for font_key, font_data in fonts_dict.items():
-                normalized_font_name = _normalize_font_name(font_data.name)
-                usage = font_stats.get(normalized_font_name, {})
-
-                name_upper = font_data.name.upper() if font_data.name else ""
-                variants_detected = []
-                if font_data.is_bold:
-                    variants_detected.append("Bold")
-                if font_data.is_italic:
-                    variants_detected.append("Italic")
-                if "NARROW" in name_upper:
-                    variants_detected.append("Narrow")
-                if "CONDENSED" in name_upper:
-                    variants_detected.append("Condensed")
-                if "LIGHT" in name_upper:
-                    variants_detected.append("Light")
-                if "BLACK" in name_upper:
-                    variants_detected.append("Black")
-
-                font_info = {
-                    "name": font_data.name,
-                    "base_font": font_data.base_font,
-                    "normalized_name": normalized_font_name,
-                    "variants": variants_detected,
-                    "embedded": font_data.font_file_path is not None,
-                    "encoding": getattr(font_data, 'encoding', ''),
-                    "xref": getattr(font_data, 'xref', None),
-                    "usage": {
-                        "occurrences": usage.get("occurrences", 0),
-                        "pages": sorted(list(usage.get("pages", set()))),
-                        "sizes": sorted(list(usage.get("sizes", set())))
-                    }
+        # Estatísticas de uso por fonte
+        # Páginas e tamanhos acumulados em listas (uma entrada por ocorrência);
+        # a deduplicação acontece uma única vez, ao montar fonts_info
+        font_stats = defaultdict(lambda: {"pages": [], "sizes": []})
+        normalize = _normalize_font_name
+        for text_obj in text_objects:
+            entry = font_stats[normalize(text_obj.font_name)]
+            entry["pages"].append(text_obj.page)
+            entry["sizes"].append(text_obj.font_size)
+
+        # Preparar dados para exibição
+        fonts_info = []
+        for font_key, font_data in fonts_dict.items():
+            normalized_font_name = _normalize_font_name(font_data.name)
+            usage = font_stats.get(normalized_font_name, {})
+
+            variants_detected = []
+            if font_data.is_bold:
+                variants_detected.append("Bold")
+            if font_data.is_italic:
+                variants_detected.append("Italic")
+            variants_detected.extend(detect_name_variants(font_data.name))
+
+            font_info = {
+                "name": font_data.name,
+                "base_font": font_data.base_font,
+                "normalized_name": normalized_font_name,
+                "variants": variants_detected,
+                "embedded": font_data.font_file_path is not None,
+                "encoding": getattr(font_data, 'encoding', ''),
+                "xref": getattr(font_data, 'xref', None),
+                "usage": {
+                    "occurrences": len(usage.get("pages", ())),
+                    "pages": sorted(set(usage.get("pages", ()))),
+                    "sizes": sorted(set(usage.get("sizes", ())))
                 }
-                fonts_info.append(font_info)
-
-            fonts_info.sort(key=lambda x: x["name"] or "")
-
-            # Exibir no console
-            print()
-            print(f"Fontes encontradas no PDF: {len(fonts_info)}")
-            print()
+            }
+            fonts_info.append(font_info)
 
-            verbose = has_flag(args, 'verbose', 'l')
+        fonts_info.sort(key=lambda x: x["name"] or "")
 
-            for i, font_info in enumerate(fonts_info, 1):
-                variant_str = f" ({', '.join(font_info['variants'])})" if font_info['variants'] else ""
-                embedded_str = " [EMBEDDED]" if font_info["embedded"] else " [NAO EMBEDDED]"
+        # Exibir no console: linhas acumuladas e escritas de uma só vez
+        lines = ["", f"Fontes encontradas no PDF: {len(fonts_info)}", ""]
 
-                display_name = font_info.get('normalized_name', font_info['name']) or 'N/A'
-                print(f"{i}. {display_name}{variant_str}{embedded_str}")
+        for i, font_info in enumerate(fonts_info, 1):
+            variant_str = f" ({', '.join(font_info['variants'])})" if font_info['variants'] else ""
+            embedded_str = " [EMBEDDED]" if font_info["embedded"] else " [NAO EMBEDDED]"
 
-                if font_info["usage"]["occurrences"] > 0:
-                    print(f"   Usada em: {font_info['usage']['occurrences']} ocorrencia(s)")
-                    if verbose or len(font_info['usage']['pages']) <= 10:
-                        print(f"   Paginas: {', '.join(map(str, font_info['usage']['pages']))}")
-                    else:
-                        pages_str = f"{', '.join(map(str, font_info['usage']['pages'][:5]))}, ... (+{len(font_info['usage']['pages'])-5} mais)"
-                        print(f"   Paginas: {pages_str}")
+            display_name = font_info.get('normalized_name', font_info['name']) or 'N/A'
+            lines.append(f"{i}. {display_name}{variant_str}{embedded_str}")
 
-                    if font_info['usage']['sizes']:
-                        sizes_str = ", ".join([f"{s}pt" for s in font_info['usage']['sizes'][:10]])
-                        if len(font_info['usage']['sizes']) > 10:
-                            sizes_str += f" (+{len(font_info['usage']['sizes'])-10} mais)"
-                        print(f"   Tamanhos: {sizes_str}")
+            usage = font_info["usage"]
+            if usage["occurrences"] > 0:
+                lines.append(f"   Usada em: {usage['occurrences']} ocorrencia(s)")
+                # Só as páginas/tamanhos exibidos são convertidos em texto
+                pages = usage["pages"]
+                if verbose or len(pages) <= 10:
+                    pages_str = ", ".join(map(str, pages))
                 else:
-                    print(f"   Nao usada em nenhum objeto de texto extraido")
-
-                if font_info["base_font"] and font_info["base_font"] != font_info["name"]:
-                    print(f"   Base: {font_info['base_font']}")
-
-                if verbose and font_info["encoding"]:
-                    print(f"   Encoding: {font_info['encoding']}")
-
-                if verbose and font_info["xref"]:
-                    print(f"   XRef: {font_info['xref']}")
-
-                print()
-
-            # Salvar em JSON se solicitado
-            output_file = get_flag_value(args, 'output', 'o')
-            if output_file:
-                output_data = {
-                    "pdf_path": pdf_path,
-                    "total_fonts": len(fonts_info),
-                    "fonts": fonts_info
-                }
-                with open(output_file, "w", encoding="utf-8") as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False)
-                print_success(f"Informacoes salvas em: {output_file}")
+                    pages_str = f"{', '.join(map(str, pages[:5]))}, ... (+{len(pages)-5} mais)"
+                lines.append(f"   Paginas: {pages_str}")
+
+                sizes = usage["sizes"]
+                if sizes:
+                    sizes_str = ", ".join(f"{s}pt" for s in sizes[:10])
+                    if len(sizes) > 10:
+                        sizes_str += f" (+{len(sizes)-10} mais)"
+                    lines.append(f"   Tamanhos: {sizes_str}")
+            else:
+                lines.append(f"   Nao usada em nenhum objeto de texto extraido")
+
+            if font_info["base_font"] and font_info["base_font"] != font_info["name"]:
+                lines.append(f"   Base: {font_info['base_font']}")
+
+            if verbose and font_info["encoding"]:
+                lines.append(f"   Encoding: {font_info['encoding']}")
+
+            if verbose and font_info["xref"]:
+                lines.append(f"   XRef: {font_info['xref']}")
+
+            lines.append("")
+
+        print("\n".join(lines))
+
+        # Salvar em JSON se solicitado
+        output_file = get_flag_value(args, 'output', 'o')
+        if output_file:
+            output_data = {
+                "pdf_path": pdf_path,
+                "total_fonts": len(fonts_info),
+                "fonts": fonts_info
+            }
+            # orjson quando disponível (mesmo gravador do export-objects)
+            from app import services
+            services.write_json(output_file, output_data)
+            print_success(f"Informacoes salvas em: {output_file}")
 
         return 0
 
@@ -369,8 +400,7 @@ def cmd_list_fonts(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
@@ -381,6 +411,7 @@ def cmd_list_fonts(args: Dict[str, Any]) -> int:
 
 def cmd_edit_text(args: Dict[str, Any]) -> int:
     """Comando edit-text: Edita objeto de texto no PDF."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -396,6 +427,8 @@ def cmd_edit_text(args: Dict[str, Any]) -> int:
         _validate_pdf_path(pdf_path)
         _validate_input_output_paths(pdf_path, output)
 
+        from app import services
+
         # Validar new-content obrigatório
         new_content = get_flag_value(args, 'new-content', 'new_content')
         if not new_content:
@@ -416,7 +449,6 @@ def cmd_edit_text(args: Dict[str, Any]) -> int:
         all_occurrences = has_flag(args, 'all-occurrences')
         prefer_engine = get_flag_value(args, 'prefer-engine', default='pymupdf')
         force = has_flag(args, 'force', 'q')
-        verbose = has_flag(args, 'verbose', 'l')
 
         # Converter tipos
         if x is not None:
@@ -448,48 +480,50 @@ def cmd_edit_text(args: Dict[str, Any]) -> int:
         if all_occurrences:
             # Pré-verificar fontes faltantes
             from app.pdf_repo import PDFRepository
-            from core.font_manager import FontManager, FontMatchQuality
+            from core.font_manager import FontManager
 
             preview_font_manager = FontManager()
-            with PDFRepository(pdf_path) as repo:
-                if content:
+            if content:
+                with PDFRepository(pdf_path) as repo:
                     text_objects = repo.extract_text_objects()
-                    fonts_dict = repo.extract_fonts()
                     target_objects = [obj for obj in text_objects if content in obj.content]
 
-                    for obj in target_objects:
-                        font_loaded, font_source = repo.get_font_for_text_object(obj.font_name, fonts_dict)
-                        if font_loaded:
-                            loaded_font_name = font_loaded.name if hasattr(font_loaded, 'name') else ""
-                            font_name_matches = (loaded_font_name.lower() in obj.font_name.lower() or
-                                               obj.font_name.lower() in loaded_font_name.lower())
-
-                            if font_source in ["extracted", "embedded"]:
-                                match_quality = FontMatchQuality.EXACT
-                            elif font_name_matches and font_source in ["system", "cache"]:
-                                match_quality = FontMatchQuality.EXACT
-                            elif font_source in ["system", "cache"] and not font_name_matches:
-                                match_quality = FontMatchQuality.VARIANT
-                            elif font_source == "fallback":
-                                match_quality = FontMatchQuality.FALLBACK
-                            else:
-                                match_quality = FontMatchQuality.SIMILAR
-
+                    # Sem ocorrências não há fontes a verificar: o serviço
+                    # informa zero ocorrências
+                    if target_objects:
+                        fonts_dict = repo.extract_fonts()
+                        # A fonte de cada nome é resolvida uma só vez (as ocorrências
+                        # repetem poucas fontes)
+                        resolved_fonts = {}
+                        for obj in target_objects:
+                            resolved = resolved_fonts.get(obj.font_name)
+                            if resolved is None:
+                                font_loaded, font_source = repo.get_font_for_text_object(obj.font_name, fonts_dict)
+                                if font_loaded:
+                                    loaded_font_name = font_loaded.name if hasattr(font_loaded, 'name') else ""
+                                    loaded_lower = loaded_font_name.lower()
+                                    obj_lower = obj.font_name.lower()
+                                    font_name_matches = loaded_lower in obj_lower or obj_lower in loaded_lower
+                                    match_quality = _MATCH_QUALITY.get(
+                                        (font_source, font_name_matches), FontMatchQuality.SIMILAR
+                                    )
+                                    system_path = getattr(font_loaded, '_fontfile', None)
+                                else:
+                                    loaded_font_name = None
+                                    match_quality = FontMatchQuality.MISSING
+                                    system_path = None
+                                resolved = (loaded_font_name, match_quality, system_path)
+                                resolved_fonts[obj.font_name] = resolved
+
+                            loaded_font_name, match_quality, system_path = resolved
                             if match_quality != FontMatchQuality.EXACT:
                                 preview_font_manager.add_requirement(
                                     font_name=obj.font_name,
                                     found_font=loaded_font_name,
                                     match_quality=match_quality,
-                                    system_path=getattr(font_loaded, '_fontfile', None),
+                                    system_path=system_path,
                                     page=obj.page
                                 )
-                        else:
-                            preview_font_manager.add_requirement(
-                                font_name=obj.font_name,
-                                found_font=None,
-                                match_quality=FontMatchQuality.MISSING,
-                                page=obj.page
-                            )
 
             # Solicitar confirmação se houver fontes faltantes
             if preview_font_manager.has_missing_fonts():
@@ -571,14 +605,14 @@ def cmd_edit_text(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
 
 def cmd_pdf_to_md(args: Dict[str, Any]) -> int:
     """Comando pdf-to-md: Converte arquivo PDF para Markdown."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -596,21 +630,18 @@ def cmd_pdf_to_md(args: Dict[str, Any]) -> int:
             print_error(f"Arquivo PDF nao encontrado: {pdf_path}")
             return 1
 
-        if not pdf_path.lower().endswith('.pdf'):
+        if not _has_extension(pdf_path, '.pdf'):
             print_error(f"Arquivo de entrada deve ser .pdf: {pdf_path}")
             return 1
 
         # Validar arquivo de saída
-        if not md_path.lower().endswith('.md'):
+        if not _has_extension(md_path, '.md'):
             print_error(f"Arquivo de saida deve ser .md: {md_path}")
             return 1
 
         # Validar que entrada e saída são diferentes
         _validate_input_output_paths(pdf_path, md_path)
 
-        # Processar opções
-        verbose = has_flag(args, 'verbose', 'l')
-
         # Importar converter
         from app.pdf_converter import convert_pdf_to_markdown
 
@@ -643,14 +674,14 @@ def cmd_pdf_to_md(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if verbose or has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
 
 def cmd_pdf_to_html(args: Dict[str, Any]) -> int:
     """Comando pdf-to-html: Converte arquivo PDF para HTML."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -668,21 +699,18 @@ def cmd_pdf_to_html(args: Dict[str, Any]) -> int:
             print_error(f"Arquivo PDF nao encontrado: {pdf_path}")
             return 1
 
-        if not pdf_path.lower().endswith('.pdf'):
+        if not _has_extension(pdf_path, '.pdf'):
             print_error(f"Arquivo de entrada deve ser .pdf: {pdf_path}")
             return 1
 
         # Validar arquivo de saída
-        if not html_path.lower().endswith(('.html', '.htm')):
+        if not _has_extension(html_path, '.html', '.htm'):
             print_error(f"Arquivo de saida deve ser .html ou .htm: {html_path}")
             return 1
 
         # Validar que entrada e saída são diferentes
         _validate_input_output_paths(pdf_path, html_path)
 
-        # Processar opções
-        verbose = has_flag(args, 'verbose', 'l')
-
         # Importar converter
         from app.pdf_converter import convert_pdf_to_html
 
@@ -715,14 +743,14 @@ def cmd_pdf_to_html(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if verbose or has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
 
 def cmd_pdf_to_txt(args: Dict[str, Any]) -> int:
     """Comando pdf-to-txt: Converte arquivo PDF para texto puro."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -740,21 +768,18 @@ def cmd_pdf_to_txt(args: Dict[str, Any]) -> int:
             print_error(f"Arquivo PDF nao encontrado: {pdf_path}")
             return 1
 
-        if not pdf_path.lower().endswith('.pdf'):
+        if not _has_extension(pdf_path, '.pdf'):
             print_error(f"Arquivo de entrada deve ser .pdf: {pdf_path}")
             return 1
 
         # Validar arquivo de saída
-        if not txt_path.lower().endswith('.txt'):
+        if not _has_extension(txt_path, '.txt'):
             print_error(f"Arquivo de saida deve ser .txt: {txt_path}")
             return 1
 
         # Validar que entrada e saída são diferentes
         _validate_input_output_paths(pdf_path, txt_path)
 
-        # Processar opções
-        verbose = has_flag(args, 'verbose', 'l')
-
         # Importar converter
         from app.pdf_converter import convert_pdf_to_txt
 
@@ -787,8 +812,7 @@ def cmd_pdf_to_txt(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if verbose or has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
 
@@ -844,6 +868,7 @@ def cmd_split(args: Dict[str, Any]) -> int:
 
 def cmd_md_to_pdf(args: Dict[str, Any]) -> int:
     """Comando md-to-pdf: Converte arquivo Markdown para PDF."""
+    verbose = has_flag(args, 'verbose', 'l')
     try:
         # Validar argumentos posicionais
         if len(args['positional']) < 2:
@@ -855,18 +880,14 @@ def cmd_md_to_pdf(args: Dict[str, Any]) -> int:
         md_path = args['positional'][0]
         pdf_path = args['positional'][1]
 
-        # Validar arquivo de entrada
-        md_file = Path(md_path)
-        if not md_file.exists():
-            print_error(f"Arquivo markdown nao encontrado: {md_path}")
-            return 1
-
-        if not md_path.lower().endswith('.md'):
+        # Validar arquivo de entrada (a existência é verificada pelo conversor,
+        # que levanta FileNotFoundError tratado abaixo)
+        if not _has_extension(md_path, '.md'):
             print_error(f"Arquivo de entrada deve ser .md: {md_path}")
             return 1
 
         # Validar arquivo de saída
-        if not pdf_path.lower().endswith('.pdf'):
+        if not _has_extension(pdf_path, '.pdf'):
             print_error(f"Arquivo de saida deve ser .pdf: {pdf_path}")
             return 1
 
@@ -875,7 +896,6 @@ def cmd_md_to_pdf(args: Dict[str, Any]) -> int:
 
         # Processar opções
         css_path = get_flag_value(args, 'css')
-        verbose = has_flag(args, 'verbose', 'l')
 
         # Importar converter
         from app.md_converter import convert_md_to_pdf
@@ -910,7 +930,6 @@ def cmd_md_to_pdf(args: Dict[str, Any]) -> int:
         return 1
     except Exception as e:
         print_error(f"Erro inesperado: {str(e)}")
-        if verbose or has_flag(args, 'verbose', 'l'):
-            import traceback
+        if verbose:
             traceback.print_exc()
         return 1
@@ -122,7 +122,8 @@ class EngineManager:
         comparisons = []
 
         # Filtrar apenas objetos originais que foram editados
-        target_original_objects = [obj for obj in original_objects if obj.id in target_object_ids]
+        target_ids = set(target_object_ids)
+        target_original_objects = [obj for obj in original_objects if obj.id in target_ids]
 
         # Tolerâncias para comparação (em pontos)
         POSITION_X_TOLERANCE = 1.0  # Posição X muda pouco
@@ -386,7 +387,8 @@ class EngineManager:
 
             # Criar dicionário de objetos originais por ID para busca rápida
             original_by_id = {obj.id: obj for obj in original_objects}
-            target_objects = [obj for obj in original_objects if obj.id in target_object_ids]
+            target_ids = set(target_object_ids)
+            target_objects = [obj for obj in original_objects if obj.id in target_ids]
 
             # Abrir PDF original
             with open(pdf_path, "rb") as input_file:
@@ -661,7 +663,8 @@ def create_audit_log(
     pdf_path: str,
     output_path: str,
     engine_results: List[EngineResult],
-    operation_type: str
+    operation_type: str,
+    include_attempts: bool = True
 ) -> Dict[str, Any]:
     """
     Função auxiliar para criar log de auditoria completo.
@@ -671,6 +674,8 @@ def create_audit_log(
         output_path: Caminho do PDF modificado
         engine_results: Lista de resultados dos engines tentados
         operation_type: Tipo de operação
+        include_attempts: Se False, omite "engine_attempts" (usado por
+            write_audit_log, que grava as tentativas uma a uma)
 
     Returns:
         Dicionário com dados de auditoria completos
@@ -698,7 +703,6 @@ def create_audit_log(
         "output_file": output_path,
         "input_hash": input_hash,
         "output_hash": output_hash,
-        "engine_attempts": [result.to_dict() for result in engine_results],
         "final_engine_used": engine_results[-1].engine.value if engine_results else None,
         "final_success": engine_results[-1].success if engine_results else False,
         "any_font_fallback": any(result.any_font_fallback for result in engine_results),
@@ -712,4 +716,56 @@ def create_audit_log(
     audit_id_content = f"{pdf_path}{operation_type}{datetime.now().isoformat()}"
     audit["operation_id"] = hashlib.md5(audit_id_content.encode()).hexdigest()
 
+    if include_attempts:
+        audit["engine_attempts"] = [result.to_dict() for result in engine_results]
+
     return audit
+
+
+def write_audit_log(
+    log_dir: str,
+    pdf_path: str,
+    output_path: str,
+    engine_results: List[EngineResult],
+    operation_type: str
+) -> str:
+    """
+    Grava o log de auditoria em disco de forma incremental.
+
+    Os campos de resumo são gravados primeiro e cada tentativa de engine
+    (com todas as suas comparações de fonte) é serializada e escrita
+    individualmente, sem montar o log completo em memória.
+
+    Args:
+        log_dir: Diretório onde o arquivo audit_<operation_id>.json é criado
+        pdf_path: Caminho do PDF original
+        output_path: Caminho do PDF modificado
+        engine_results: Lista de resultados dos engines tentados
+        operation_type: Tipo de operação
+
+    Returns:
+        Caminho do arquivo de auditoria criado
+    """
+    audit = create_audit_log(
+        pdf_path=pdf_path,
+        output_path=output_path,
+        engine_results=engine_results,
+        operation_type=operation_type,
+        include_attempts=False
+    )
+
+    audit_path = Path(log_dir) / f"audit_{audit['operation_id']}.json"
+    audit_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(audit_path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in audit.items():
+            value_json = json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            f.write(f"  {json.dumps(key)}: {value_json},\n")
+        f.write('  "engine_attempts": [')
+        for index, result in enumerate(engine_results):
+            attempt_json = json.dumps(result.to_dict(), ensure_ascii=False, indent=2).replace("\n", "\n    ")
+            f.write(("," if index else "") + "\n    " + attempt_json)
+        f.write("\n  ]\n}\n")
+
+    return str(audit_path)
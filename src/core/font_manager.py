@@ -11,6 +11,7 @@ Este módulo é responsável por:
 from dataclasses import dataclass
 from typing import List, Optional, Dict
 from enum import Enum
+import re
 
 
 class FontMatchQuality(Enum):
@@ -22,6 +23,38 @@ class FontMatchQuality(Enum):
     MISSING = "missing"  # Fonte não encontrada
 
 
+# Variantes detectadas pelo nome da fonte (além de Bold/Italic, que vêm das
+# flags da fonte), na ordem em que são exibidas
+FONT_NAME_VARIANTS = {
+    "NARROW": "Narrow",
+    "CONDENSED": "Condensed",
+    "LIGHT": "Light",
+    "BLACK": "Black",
+}
+_FONT_NAME_VARIANT_RE = re.compile("|".join(FONT_NAME_VARIANTS))
+
+
+def detect_name_variants(font_name: Optional[str]) -> List[str]:
+    """
+    Detecta variantes (Narrow, Condensed, Light, Black) pelo nome da fonte.
+
+    O nome é varrido uma única vez; cada rótulo aparece no máximo uma vez,
+    na ordem de FONT_NAME_VARIANTS (não na ordem em que aparece no nome).
+
+    Args:
+        font_name: Nome da fonte (ex: "ARIALNARROW-BOLD").
+
+    Returns:
+        List[str]: Rótulos das variantes encontradas.
+    """
+    if not font_name:
+        return []
+    found = set(_FONT_NAME_VARIANT_RE.findall(font_name.upper()))
+    if not found:
+        return []
+    return [label for token, label in FONT_NAME_VARIANTS.items() if token in found]
+
+
 @dataclass
 class FontRequirement:
     """Requisito de fonte para edição de PDF."""
@@ -30,6 +30,7 @@ def test_parse_page_numbers():
     assert services.parse_page_numbers("1,3,5") == [1, 3, 5]
     assert services.parse_page_numbers("1-5") == [1, 2, 3, 4, 5]
     assert services.parse_page_numbers("1,3-5,7") == [1, 3, 4, 5, 7]
+    assert services.parse_page_numbers("5-8,1-6,2") == [1, 2, 3, 4, 5, 6, 7, 8]
 
 
 def test_parse_page_ranges():
@@ -39,6 +40,24 @@ def test_parse_page_ranges():
     assert services.parse_page_ranges("1,3-5") == [(1, 1), (3, 5)]
 
 
+def test_hex_to_rgb():
+    """Testa conversão de cor hex para RGB normalizado."""
+    assert services._hex_to_rgb("#FF0000") == (1.0, 0.0, 0.0)
+    assert services._hex_to_rgb("0000ff") == (0.0, 0.0, 1.0)
+    assert services._hex_to_rgb(None) == (0, 0, 0)
+    assert services._hex_to_rgb("#FFF") == (0, 0, 0)
+    # Entradas que int(..., 16) aceitaria ou rejeitaria com erro também viram preto
+    for invalid in ("zzzzzz", "0x1234", "12_345", "-12345", " 12345"):
+        assert services._hex_to_rgb(invalid) == (0, 0, 0)
+
+
+def test_backup_needed():
+    """Testa que o backup só é feito quando a saída sobrescreve a entrada."""
+    assert services._backup_needed(True, "doc.pdf", "doc.pdf")
+    assert not services._backup_needed(True, "doc.pdf", "saida.pdf")
+    assert not services._backup_needed(False, "doc.pdf", "doc.pdf")
+
+
 def test_center_and_pad_text():
     """Testa cálculo de centralização e padding de texto."""
     text_obj = TextObject(
@@ -59,6 +78,21 @@ def test_center_and_pad_text():
     assert "Novo" in padded
     assert len(padded) >= len("Novo")
 
+    # Número ímpar de espaços: o espaço extra fica à direita
+    narrow_obj = TextObject(
+        id="test-456",
+        page=0,
+        content="XXXXXXX",
+        x=0.0,
+        y=0.0,
+        width=70.0,
+        height=10.0,
+        font_name="Arial",
+        font_size=12,
+        color="#000000"
+    )
+    assert services.center_and_pad_text(narrow_obj, "ab") == "  ab   "
+
     # Teste de erro com texto muito grande
     try:
         services.center_and_pad_text(text_obj, "A" * 1000)
@@ -95,6 +129,53 @@ def test_operation_logger():
     assert loaded_log["operation_type"] == "test-operation"
 
 
+def test_operation_logger_buffered():
+    """Testa que o logger em lote só grava ao atingir o buffer ou no flush."""
+    log_dir = Path(tempfile.mkdtemp())
+    logger = OperationLogger(log_dir=str(log_dir), buffer_size=2)
+    jsonl = log_dir / "operations.jsonl"
+
+    first = logger.log_operation(operation_type="op-1")
+    assert not jsonl.exists()
+
+    logger.log_operation(operation_type="op-2")
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 2
+    assert Path(first["log_file"]).exists()
+
+    logger.log_operation(operation_type="op-3")
+    logger.flush()
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_operation_logger_disabled():
+    """Testa que logger desabilitado não monta nem grava logs."""
+    log_dir = Path(tempfile.mkdtemp()) / "logs"
+    logger = OperationLogger(log_dir=str(log_dir), enabled=False)
+
+    def build_result():
+        raise AssertionError("Resultado não deveria ser montado")
+
+    log = logger.log_operation(
+        operation_type="test-operation",
+        result=build_result,
+        notes=lambda: "não avaliado"
+    )
+
+    assert log == {}
+    assert not logger.is_enabled()
+    assert not log_dir.exists()
+
+    # Habilitado: funções são avaliadas
+    logger = OperationLogger(log_dir=str(log_dir))
+    log = logger.log_operation(
+        operation_type="test-operation",
+        result=lambda: {"status": "success"},
+        notes=lambda: "avaliado"
+    )
+    assert log["result"] == {"status": "success"}
+    assert log["notes"] == "avaliado"
+
+
 def test_edit_metadata_structure():
     """Testa estrutura da função edit_metadata."""
     # Função deve aceitar os parâmetros corretos
@@ -150,8 +231,12 @@ def main():
     tests = [
         test_parse_page_numbers,
         test_parse_page_ranges,
+        test_hex_to_rgb,
+        test_backup_needed,
         test_center_and_pad_text,
         test_operation_logger,
+        test_operation_logger_buffered,
+        test_operation_logger_disabled,
         test_edit_metadata_structure,
         test_merge_pdf_structure,
         test_split_pdf_structure,
@@ -199,6 +199,73 @@ def test_export_objects_invalid_pdf(temp_dir: Path):
     print("✓ Erro esperado lançado corretamente para PDF inexistente")
 
 
+def test_find_text_pages_skips_graphics_only_pages(temp_dir: Path):
+    """Teste REAL: Páginas sem texto são ignoradas na busca por texto."""
+    test_pdf = temp_dir / "mixed_pages.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Pagina com texto", fontname="helv")
+    doc.new_page().draw_rect(fitz.Rect(50, 50, 200, 200), color=(1, 0, 0))
+    doc.new_page().insert_text((72, 72), "Outra pagina", fontname="helv")
+    doc.save(test_pdf)
+    doc.close()
+
+    with PDFRepository(str(test_pdf)) as repo:
+        text_pages = repo.find_text_pages()
+        text_objects = repo.extract_text_objects(pages=text_pages)
+        all_objects = repo.extract_text_objects()
+
+    # VALIDAÇÃO REAL
+    assert text_pages == [0, 2], f"Páginas com texto incorretas: {text_pages}"
+    assert [obj.id for obj in text_objects] == [obj.id for obj in all_objects]
+
+    print("✓ Página apenas com gráficos ignorada na extração")
+
+
+def test_extract_text_objects_cache_returns_copies(temp_dir: Path):
+    """Teste REAL: Alterar objetos retornados não corrompe o cache de extração."""
+    test_pdf = temp_dir / "cached.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Texto original", fontname="helv")
+    doc.save(test_pdf)
+    doc.close()
+
+    with PDFRepository(str(test_pdf)) as repo:
+        first = repo.extract_text_objects()
+        first[0].content = "Alterado"
+        second = repo.extract_text_objects()
+        second[0].x = -1.0
+        third = repo.extract_text_objects()
+
+    # VALIDAÇÃO REAL
+    assert third[0].content == "Texto original"
+    assert third[0].x != -1.0
+    assert third[0].id == first[0].id
+
+    print("✓ Cache de extração isolado de alterações do chamador")
+
+
+def test_extract_text_objects_indexed(temp_dir: Path):
+    """Teste REAL: Índices por ID e por página batem com a lista extraída."""
+    test_pdf = temp_dir / "indexed.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Primeira", fontname="helv")
+    page = doc.new_page()
+    page.insert_text((72, 72), "Segunda", fontname="helv")
+    page.insert_text((72, 144), "Terceira", fontname="helv")
+    doc.save(test_pdf)
+    doc.close()
+
+    with PDFRepository(str(test_pdf)) as repo:
+        text_objects, by_id, by_page = repo.extract_text_objects_indexed()
+
+    # VALIDAÇÃO REAL
+    assert len(by_id) == len(text_objects) == 3
+    assert all(by_id[obj.id] is obj for obj in text_objects)
+    assert [obj.content for obj in by_page[1]] == ["Segunda", "Terceira"]
+
+    print("✓ Índices de objetos de texto consistentes")
+
+
 # ============================================================================
 # TESTES DE EDIÇÃO DE TEXTO (edit-text)
 # ============================================================================
@@ -293,6 +360,37 @@ def test_edit_text_by_content_real(sample_pdf_with_text: Path, temp_dir: Path):
     print(f"✓ Texto editado por conteúdo REALMENTE no PDF")
 
 
+def test_edit_text_in_place_rewrites_file(temp_dir: Path):
+    """Teste REAL: Edição no próprio arquivo não deixa o texto antigo recuperável."""
+    test_pdf = temp_dir / "in_place.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Texto original", fontname="helv")
+    doc.save(test_pdf)
+    doc.close()
+
+    services.edit_text(
+        pdf_path=str(test_pdf),
+        output_path=str(test_pdf),
+        search_content="original",
+        new_content="alterado",
+        create_backup=False
+    )
+
+    with PDFRepository(str(test_pdf)) as repo:
+        contents = [obj.content for obj in repo.extract_text_objects()]
+    assert "Texto alterado" in contents
+
+    # VALIDAÇÃO REAL: cortar o arquivo no primeiro %%EOF não recupera uma
+    # revisão anterior com o texto substituído
+    data = test_pdf.read_bytes()
+    first_revision = data[:data.index(b"%%EOF") + len(b"%%EOF")]
+    with fitz.open(stream=first_revision, filetype="pdf") as old_doc:
+        old_text = "".join(page.get_text() for page in old_doc)
+    assert "Texto original" not in old_text
+
+    print("✓ Edição no próprio arquivo sem revisão antiga recuperável")
+
+
 def test_edit_text_not_found(sample_pdf: Path, temp_dir: Path):
     """Teste REAL: Erro esperado ao editar texto inexistente."""
     output_pdf = temp_dir / "output.pdf"
@@ -563,6 +661,36 @@ def test_edit_metadata_real(sample_pdf: Path, temp_dir: Path):
     print("✓ Metadados editados REALMENTE no PDF")
 
 
+def test_edit_metadata_noop_copies_file(sample_pdf: Path, temp_dir: Path):
+    """Teste REAL: edit_metadata sem campos não reescreve o PDF."""
+    output_pdf = temp_dir / "noop_metadata.pdf"
+
+    result_path = services.edit_metadata(
+        pdf_path=str(sample_pdf),
+        output_path=str(output_pdf)
+    )
+
+    # VALIDAÇÃO REAL: saída é cópia byte a byte da entrada
+    assert result_path == str(output_pdf)
+    assert output_pdf.read_bytes() == sample_pdf.read_bytes(), \
+        "PDF não deveria ter sido reescrito sem alterações de metadados"
+
+    print("✓ edit_metadata sem alterações apenas copiou o arquivo")
+
+
+def test_edit_metadata_noop_missing_pdf(temp_dir: Path):
+    """Teste REAL: edit_metadata sem campos valida o PDF de entrada."""
+    fake_pdf = temp_dir / "inexistente.pdf"
+    output_pdf = temp_dir / "noop_missing.pdf"
+
+    # VALIDAÇÃO REAL: Deve lançar exceção do projeto, sem criar a saída
+    with pytest.raises(PDFFileNotFoundError):
+        services.edit_metadata(str(fake_pdf), str(output_pdf))
+    assert not output_pdf.exists()
+
+    print("✓ Erro esperado lançado corretamente para PDF inexistente")
+
+
 # ============================================================================
 # TESTES DE MANIPULAÇÃO ESTRUTURAL
 # ============================================================================
@@ -602,6 +730,42 @@ def test_merge_pdfs_real(examples_dir: Path, temp_dir: Path):
     print(f"✓ PDFs mesclados REALMENTE ({pages1} + {pages2} = {merged_pages} páginas)")
 
 
+def test_merge_pdfs_dedupe_real(temp_dir: Path):
+    """Teste REAL: Recursos repetidos não são duplicados no PDF mesclado."""
+    deduped_pdf = temp_dir / "merged_dedupe.pdf"
+    plain_pdf = temp_dir / "merged_plain.pdf"
+
+    # A mesma imagem embutida em dois PDFs diferentes
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+    for x in range(0, 64, 4):
+        pix.set_rect(fitz.IRect(x, 0, x + 2, 64), (x * 3, 100, 255 - x))
+    image_bytes = pix.tobytes("png")
+
+    input_pdfs = []
+    for name in ("a", "b"):
+        input_pdf = temp_dir / f"image_{name}.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_image(fitz.Rect(72, 72, 272, 272), stream=image_bytes)
+        doc.save(input_pdf)
+        doc.close()
+        input_pdfs.append(str(input_pdf))
+
+    services.merge_pdf(input_pdfs, str(deduped_pdf))
+    services.merge_pdf(input_pdfs, str(plain_pdf), dedupe=False)
+
+    def image_xrefs(pdf_path: Path) -> set:
+        with fitz.open(pdf_path) as doc:
+            return {img[0] for page in doc for img in page.get_images()}
+
+    # VALIDAÇÃO REAL: uma única cópia da imagem e arquivo menor
+    assert len(image_xrefs(plain_pdf)) == 2
+    assert len(image_xrefs(deduped_pdf)) == 1
+    assert deduped_pdf.stat().st_size < plain_pdf.stat().st_size, \
+        "PDF deduplicado deveria ser menor que o PDF sem deduplicação"
+
+    print(f"✓ Merge com deduplicação: {deduped_pdf.stat().st_size} < {plain_pdf.stat().st_size} bytes")
+
+
 def test_delete_pages_real(sample_pdf: Path, temp_dir: Path):
     """Teste REAL: Exclui páginas e valida resultado."""
     output_pdf = temp_dir / "deleted_pages.pdf"